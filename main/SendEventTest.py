@@ -2,8 +2,8 @@ import cv2
 import numpy as np
 import mss
 import time
-import win32api
-import win32con
+
+from services.InputDispatcher import get_dispatcher
 
 def find_window_by_title(partial_title):
     """
@@ -47,11 +47,11 @@ def send_click_to_window(hwnd, x, y):
     Args:
         hwnd (int): 대상 창의 핸들.
         x, y (int): 클릭할 창 내부 좌표.
+    Returns:
+        EventPlan: 예약된 클릭 (완료를 기다려야 하면 .wait()).
     """
-    lparam = win32api.MAKELONG(x, y)
-    win32api.PostMessage(hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, lparam)
-    time.sleep(0.1)
-    win32api.PostMessage(hwnd, win32con.WM_LBUTTONUP, 0, lparam)
+    # 누름 → 0.1초 → 뗌 은 디스패처 스레드에서 실행 (호출한 스레드는 기다리지 않음)
+    return get_dispatcher().click(hwnd, x, y, hold=0.1)
 
 def track_and_chase_icon(template_path, process_name="Diablo II:"):
     """
@@ -1,11 +1,13 @@
 from services.WindowsService import QApplication, DiabloManagerApp
 import sys
 from services.UACAdmin import AdminProcess
+from services.LogService import configure_logging
 
 
 
 def main():
     """관리자 권한 확인 후 DiabloManagerApp 실행"""
+    configure_logging()  # 로그 폴더 생성 / 비동기 로그 스레드 시작
     if not AdminProcess.is_admin():
         print("관리자 권한이 필요합니다. 관리자 권한으로 재실행합니다.")
         AdminProcess.run_as_admin()
@@ -0,0 +1,210 @@
+"""
+연속 캡처/탐지 엔진 - 캡처 세션 하나를 유지하면서 목표 FPS 에 맞춰 탐지를 반복한다.
+"""
+import threading
+import time
+
+from services.FrameDiffService import FrameChangeGate
+from services.FrameSource import MssFrameSource
+from services.ImageSearch import IconDetector
+from services.EventLogService import event_log as default_event_log
+from services.LogService import LogHandler
+from services.MetricsService import metrics
+from services.TrackingService import IconTracker
+
+
+class DetectionResult:
+    """한 프레임의 탐지 결과"""
+
+    def __init__(self, frame_index, timestamp, detections, elapsed, skipped=False):
+        self.frame_index = frame_index  # 엔진 시작 후 처리한 프레임 번호
+        self.timestamp = timestamp  # 캡처 시각 (time.perf_counter)
+        self.detections = detections  # 점수 내림차순 Detection 리스트 (캡처 영역 기준 좌표)
+        self.elapsed = elapsed  # 캡처 + 탐지 소요 시간 (초)
+        self.skipped = skipped  # 화면 변화가 없어 탐지를 생략하고 이전 결과를 재사용했는지 여부
+
+    @property
+    def positions(self):
+        """탐지된 십자의 중심 좌표 리스트"""
+        return [(detection.x, detection.y) for detection in self.detections]
+
+    def __repr__(self):
+        return f"DetectionResult(frame={self.frame_index}, count={len(self.detections)}, elapsed={self.elapsed * 1000:.1f}ms)"
+
+
+class DetectionEngine:
+    """
+    IconDetector 위에서 동작하는 장기 실행 탐지 엔진.
+    사용 예:
+        engine = DetectionEngine(screen_info, template_path, target_fps=30)
+        for result in engine.results():      # 제너레이터 방식
+            ...
+        engine.start(callback)               # 콜백 방식 (백그라운드 스레드)
+        engine.stop()
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, info, template_path, detector=None, threshold=0.6, scales=[0.6, 0.8, 1.0, 1.2], target_fps=30,
+                 tracking=False, full_scan_interval=30, source=None, recorder=None, change_gate=None,
+                 event_log=None):
+        """
+        Args:
+            info (dict): 화면 캡처 영역 정보 (x, y, width, height).
+            template_path (str): 십자 모양 템플릿 이미지 경로.
+            detector (IconDetector): 사용할 탐지기. 없으면 새로 생성.
+            threshold (float): 탐지 민감도.
+            scales (list): 템플릿 크기 조정 비율 리스트.
+            target_fps (float): 목표 초당 프레임 수.
+            tracking (bool): True 면 이전 탐지 위치 주변(ROI)만 매칭하는 추적 모드 사용.
+            full_scan_interval (int): 추적 모드에서 전체 화면 탐지 주기 (프레임).
+            source (FrameSource): 프레임 소스. 없으면 info 영역을 mss 로 캡처. 재생 시 target_fps=0 이면 최대 속도.
+            recorder (FrameRecorder): 지정하면 캡처한 프레임을 창 정보와 함께 녹화 (백그라운드 저장).
+            change_gate (FrameChangeGate | bool): 지정하면 화면이 바뀌지 않은 프레임은 탐지를 생략하고,
+                일부만 바뀐 프레임은 바뀐 영역만 다시 탐지. True 면 기본 설정으로 생성.
+            event_log (EventLog): 프레임별 탐지 결과를 기록할 이벤트 기록기. 없으면 공용 event_log
+                (열려 있을 때만 기록). 창 핸들은 info["hwnd"] 를 사용.
+        """
+        self.info = info
+        self.monitor = {"top": info['y'], "left": info['x'], "width": info['width'], "height": info['height']}
+        self.template_path = template_path
+        self.detector = detector if detector is not None else IconDetector()
+        self.threshold = threshold
+        self.scales = scales
+        self.target_fps = target_fps
+        self.recorder = recorder
+        self.source = source if source is not None else MssFrameSource(self.monitor)
+        self.tracker = IconTracker(self.detector, full_scan_interval=full_scan_interval) if tracking else None
+        self.change_gate = FrameChangeGate() if change_gate is True else change_gate or None
+        self.event_log = event_log if event_log is not None else default_event_log
+
+        self.frame_count = 0
+        self.missed_deadlines = 0
+        self.skipped_frames = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def frame_interval(self):
+        return 1.0 / self.target_fps if self.target_fps > 0 else 0.0
+
+    def results(self, max_frames=None):
+        """
+        탐지 결과를 프레임마다 생성합니다. 캡처 세션은 제너레이터가 끝날 때까지 유지됩니다.
+        Args:
+            max_frames (int): 처리할 최대 프레임 수. None 이면 stop() 까지 반복.
+        Yields:
+            DetectionResult: 프레임별 탐지 결과.
+        """
+        self.logger.info(f"연속 탐지 시작: {self.monitor}, 목표 FPS: {self.target_fps}")
+
+        with self.source as source:
+            next_deadline = time.perf_counter()
+            processed = 0
+            previous = None  # 직전 프레임 탐지 결과 (변화 감지 게이트용)
+            if self.change_gate is not None:
+                self.change_gate.reset()
+            while not self._stop_event.is_set():
+                if max_frames is not None and processed >= max_frames:
+                    break
+
+                # 템플릿은 레지스트리 캐시에서 가져오므로 매 프레임 호출해도 디스크/리사이즈 비용이 없다
+                resized_templates = self.detector.template_registry.get(self.template_path, self.scales)
+                if resized_templates is None:
+                    self.logger.error("탐지할 템플릿 이미지를 로드할 수 없습니다.")
+                    break
+
+                started = time.perf_counter()
+                frame = source.read()
+                if frame is None:
+                    break  # 재생 소스의 끝
+                if self.recorder is not None:
+                    self.recorder.record(frame, window_info=self.info)
+                detections, skipped = self._detect(frame, resized_templates, previous)
+                finished = time.perf_counter()
+
+                metrics.observe("frame", finished - started, skipped=skipped)
+                previous = detections
+                self.frame_count += 1
+                processed += 1
+                result = DetectionResult(self.frame_count, started, detections, finished - started, skipped)
+                if self.event_log.enabled:
+                    self.event_log.detection(self.info.get("hwnd"), result)
+                yield result
+
+                next_deadline = self._wait_next_deadline(next_deadline)
+
+        self._stop_event.clear()
+        self.logger.info(
+            f"연속 탐지 종료: {self.frame_count} 프레임, 마감 초과 {self.missed_deadlines}회, 탐지 생략 {self.skipped_frames}회"
+        )
+
+    def _detect(self, frame, resized_templates, previous):
+        """
+        한 프레임을 탐지합니다. 변화 감지 게이트가 있으면 바뀐 정도에 따라 생략 / 영역 탐지 / 전체 탐지.
+        Returns:
+            tuple: (Detection 리스트, 탐지 생략 여부)
+        """
+        change = self.change_gate.check(frame) if self.change_gate is not None else None
+        if change is not None and previous is not None:
+            if not change.changed:
+                self.skipped_frames += 1
+                return previous, True
+            if not change.full and self.tracker is None:
+                detections = self.detector.detect_regions(
+                    frame, resized_templates, change.regions, previous, self.threshold
+                )
+                return detections, False
+
+        _, detections = self.detector.detect_frame(frame, resized_templates, self.threshold, self.tracker)
+        return detections, False
+
+    def _wait_next_deadline(self, deadline):
+        """
+        다음 프레임 마감시각까지 대기합니다. 이미 지났다면 밀린 프레임은 건너뛰고 바로 진행합니다.
+        Returns:
+            float: 다음 프레임 마감시각.
+        """
+        interval = self.frame_interval
+        deadline += interval
+        now = time.perf_counter()
+        if deadline > now:
+            self._stop_event.wait(deadline - now)
+            return deadline
+
+        # 처리 시간이 프레임 간격을 넘은 경우: 밀린 주기를 따라잡지 않고 현재 시각 기준으로 재설정
+        if interval > 0:
+            self.missed_deadlines += 1
+        return now
+
+    def start(self, callback, max_frames=None):
+        """
+        백그라운드 스레드에서 탐지를 반복하고 결과마다 callback(result) 를 호출합니다.
+        Args:
+            callback (callable): DetectionResult 를 받는 함수.
+            max_frames (int): 처리할 최대 프레임 수.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("탐지 엔진이 이미 실행 중입니다.")
+
+        def run():
+            try:
+                for result in self.results(max_frames):
+                    callback(result)
+            except Exception as e:
+                self.logger.error("연속 탐지 중 오류가 발생했습니다.", e)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=run, name="DetectionEngine", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=None):
+        """탐지 반복을 중지하고 스레드 종료를 기다립니다."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
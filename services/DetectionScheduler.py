@@ -0,0 +1,331 @@
+"""
+다중 창 탐지 스케줄러 - 창별 파이프라인을 역할 가중치(stride scheduling) 순서로 스레드 풀에서 실행한다.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from services.DetectionEngine import DetectionResult
+from services.EventLogService import event_log as default_event_log
+from services.ImageSearch import IconDetector
+from services.LogService import LogHandler
+
+
+ROLE_WEIGHTS = {"Master": 4, "Slave": 2, "None": 1}
+
+
+class _ThreadLocalCapture:
+    """작업 스레드마다 mss 세션을 하나씩 유지한다 (mss 객체는 만든 스레드에서만 사용)."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def grab(self, monitor):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            import mss
+
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._lock:
+                self._sessions.append(sct)
+        shot = sct.grab(monitor)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self):
+        with self._lock:
+            for sct in self._sessions:
+                try:
+                    sct.close()
+                except Exception:
+                    pass
+            self._sessions = []
+
+
+class WindowPipeline:
+    """창 하나의 캡처 → 탐지 파이프라인"""
+
+    def __init__(self, hwnd, info, template_path, role="None", threshold=0.6, scales=[0.6, 0.8, 1.0, 1.2],
+                 target_fps=15, source=None, detector=None):
+        """
+        Args:
+            hwnd (int): 창 핸들.
+            info (dict): 화면 캡처 영역 정보 (x, y, width, height).
+            template_path (str): 십자 모양 템플릿 이미지 경로.
+            role (str): Master / Slave / None. 스케줄링 가중치 결정.
+            threshold (float): 탐지 민감도.
+            scales (list): 템플릿 크기 조정 비율 리스트.
+            target_fps (float): 창별 목표 초당 프레임 수.
+            source (FrameSource): 프레임 소스. 없으면 스케줄러의 작업 스레드별 mss 세션으로 캡처.
+            detector (IconDetector): 창 전용 탐지기 (전처리 버퍼를 창끼리 공유하지 않는다).
+        """
+        self.hwnd = hwnd
+        self.set_info(info)
+        self.template_path = template_path
+        self.role = role
+        self.threshold = threshold
+        self.scales = scales
+        self.target_fps = target_fps
+        self.source = source
+        self.detector = detector if detector is not None else IconDetector()
+
+        self.pass_value = 0.0  # 누적 가중 실행 시간 (작을수록 먼저 실행)
+        self.next_due = 0.0  # 다음 프레임을 시작할 수 있는 시각
+        self.running = False
+        self.frame_count = 0
+        self.busy_time = 0.0
+        self.last_result = None
+        self.failures = 0  # 연속 실패 횟수 (성공하면 0)
+        self.last_error = None
+
+    def set_info(self, info):
+        """캡처 영역을 바꿉니다 (창이 다른 모니터로 옮겨진 경우)."""
+        self.info = info
+        self.monitor = {"top": info['y'], "left": info['x'], "width": info['width'], "height": info['height']}
+
+    @property
+    def weight(self):
+        return ROLE_WEIGHTS.get(self.role, 1)
+
+    @property
+    def frame_interval(self):
+        return 1.0 / self.target_fps if self.target_fps > 0 else 0.0
+
+    def step(self, capture):
+        """한 프레임을 캡처하고 탐지합니다."""
+        resized_templates = self.detector.template_registry.get(self.template_path, self.scales)
+        if resized_templates is None:
+            raise FileNotFoundError(f"템플릿 파일을 찾을 수 없습니다: {self.template_path}")
+
+        started = time.perf_counter()
+        frame = self.source.read() if self.source is not None else capture.grab(self.monitor)
+        if frame is None:
+            return None
+        _, detections = self.detector.detect_frame(frame, resized_templates, self.threshold)
+        finished = time.perf_counter()
+
+        self.frame_count += 1
+        return DetectionResult(self.frame_count, started, detections, finished - started)
+
+
+class DetectionScheduler:
+    """
+    등록된 창마다 탐지 파이프라인을 동시에 실행한다.
+    사용 예:
+        scheduler = DetectionScheduler(workers=2)
+        scheduler.register(hwnd, info, template_path, role="Master")
+        scheduler.start(lambda hwnd, result: ...)
+        scheduler.stop()
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, workers=2, event_log=None, max_failures=5, retry_delay=0.5, max_retry_delay=10.0):
+        """
+        Args:
+            workers (int): 동시에 탐지할 창 수 (스레드 수).
+            event_log (EventLog): 창별 탐지 결과 기록기. 없으면 공용 event_log (열려 있을 때만 기록).
+            max_failures (int): 연속으로 이 횟수만큼 실패한 창은 등록 해제하고 failed 에 기록한다.
+            retry_delay (float): 실패 후 첫 재시도까지 대기 시간 (초). 연속 실패마다 두 배씩 늘린다.
+            max_retry_delay (float): 재시도 대기 시간 상한 (초).
+        """
+        self.workers = workers
+        self.event_log = event_log if event_log is not None else default_event_log
+        self.max_failures = max_failures
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.pipelines = {}  # hwnd -> WindowPipeline
+        self.failed = {}  # hwnd -> 마지막 오류 (연속 실패로 등록 해제된 창)
+        self._capture = _ThreadLocalCapture()
+        self._condition = threading.Condition()
+        self._pool = None
+        self._thread = None
+        self._stopping = False
+        self._in_flight = 0
+        self._callback = None
+        self._on_failure = None
+
+    def register(self, hwnd, info, template_path, role="None", **options):
+        """
+        창을 등록합니다. 이미 등록된 창이면 설정을 교체합니다.
+        Args:
+            options: WindowPipeline 추가 인자 (threshold, scales, target_fps, source, detector).
+        Returns:
+            WindowPipeline: 등록된 파이프라인.
+        """
+        pipeline = WindowPipeline(hwnd, info, template_path, role, **options)
+        with self._condition:
+            previous = self.pipelines.get(hwnd)
+            # 새로 들어온 창이 pass 0 으로 시작하면 기존 창을 오래 밀어내므로 현재 최소값에서 시작
+            pipeline.pass_value = previous.pass_value if previous else self._min_pass()
+            self.pipelines[hwnd] = pipeline
+            self.failed.pop(hwnd, None)
+            self._condition.notify_all()
+        self.logger.info(f"탐지 창 등록: HWND {hwnd}, 역할 {role}")
+        return pipeline
+
+    def unregister(self, hwnd):
+        with self._condition:
+            self.pipelines.pop(hwnd, None)
+            self._condition.notify_all()
+
+    def set_role(self, hwnd, role, info=None):
+        """
+        창 역할(가중치)을 바꿉니다.
+        Args:
+            info (dict): 역할을 바꾸며 창을 옮겼으면 새 캡처 영역 (x, y, width, height).
+        Returns:
+            bool: 등록된 창이었는지 여부.
+        """
+        with self._condition:
+            pipeline = self.pipelines.get(hwnd)
+            if pipeline is None:
+                return False
+            pipeline.role = role
+            if info is not None:
+                pipeline.set_info(info)
+            self._condition.notify_all()
+        self.logger.info(f"탐지 창 역할 변경: HWND {hwnd}, 역할 {role}")
+        return True
+
+    def _min_pass(self):
+        return min((p.pass_value for p in self.pipelines.values()), default=0.0)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self, callback, on_failure=None):
+        """
+        스케줄러를 시작합니다.
+        Args:
+            callback (callable): callback(hwnd, DetectionResult) - 작업 스레드에서 호출된다.
+            on_failure (callable): on_failure(hwnd, error) - 연속 실패로 창을 등록 해제했을 때 작업 스레드에서 호출된다.
+        """
+        if self._thread is not None:
+            raise RuntimeError("스케줄러가 이미 실행 중입니다.")
+        self._callback = callback
+        self._on_failure = on_failure
+        self._stopping = False
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="DetectionScheduler")
+        self._thread = threading.Thread(target=self._dispatch_loop, name="DetectionScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """새 프레임 배정을 멈추고 진행 중인 탐지가 끝나기를 기다립니다."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self._capture.close()
+
+    def _next_ready(self, now):
+        """실행 가능한 창 중 pass 가 가장 작은 창 (같으면 가중치가 큰 창)."""
+        ready = [p for p in self.pipelines.values() if not p.running and p.next_due <= now]
+        if not ready:
+            return None
+        return min(ready, key=lambda p: (p.pass_value, -p.weight))
+
+    def _dispatch_loop(self):
+        with self._condition:
+            while not self._stopping:
+                if self._in_flight >= self.workers:
+                    self._condition.wait()
+                    continue
+
+                now = time.perf_counter()
+                pipeline = self._next_ready(now)
+                if pipeline is None:
+                    waiting = [p.next_due for p in self.pipelines.values() if not p.running]
+                    timeout = max(0.0, min(waiting) - now) if waiting else None
+                    self._condition.wait(timeout)
+                    continue
+
+                pipeline.running = True
+                self._in_flight += 1
+                self._pool.submit(self._run_step, pipeline)
+
+            while self._in_flight > 0:
+                self._condition.wait()
+
+    def _run_step(self, pipeline):
+        started = time.perf_counter()
+        result = None
+        error = None
+        try:
+            result = pipeline.step(self._capture)
+        except Exception as e:
+            error = e
+            self.logger.error(
+                f"창 탐지 중 오류가 발생했습니다. HWND {pipeline.hwnd} ({pipeline.failures + 1}/{self.max_failures})", e
+            )
+        elapsed = time.perf_counter() - started
+
+        if result is not None and self.event_log.enabled:
+            self.event_log.detection(pipeline.hwnd, result)
+
+        # 같은 창의 다음 프레임은 콜백이 끝난 뒤 배정되므로 창별 결과 순서가 유지된다
+        if result is not None and self._callback is not None:
+            try:
+                self._callback(pipeline.hwnd, result)
+            except Exception as e:
+                self.logger.error("탐지 결과 처리 중 오류가 발생했습니다.", e)
+
+        with self._condition:
+            # 가중치가 클수록 같은 실행 시간에 pass 가 적게 올라 더 자주 선택된다
+            pipeline.pass_value += elapsed / pipeline.weight
+            pipeline.busy_time += elapsed
+            pipeline.next_due = started + pipeline.frame_interval
+            pipeline.running = False
+            pipeline.last_result = result
+            registered = self.pipelines.get(pipeline.hwnd) is pipeline
+            dropped = False
+            if error is not None:
+                pipeline.failures += 1
+                pipeline.last_error = error
+                if pipeline.failures >= self.max_failures and registered:
+                    del self.pipelines[pipeline.hwnd]
+                    self.failed[pipeline.hwnd] = error
+                    dropped = True
+                    self.logger.error(
+                        f"연속 {pipeline.failures}회 실패한 창을 탐지 대상에서 제외합니다. HWND {pipeline.hwnd}", error
+                    )
+                else:
+                    # 계속 실패하는 창이 매 프레임 재시도하며 작업자와 로그를 차지하지 않도록 대기 시간을 늘린다
+                    delay = min(self.max_retry_delay, self.retry_delay * 2 ** (pipeline.failures - 1))
+                    pipeline.next_due = started + max(pipeline.frame_interval, delay)
+            else:
+                pipeline.failures = 0
+                if result is None and pipeline.source is not None and registered:
+                    # 재생 소스가 끝난 창은 더 이상 배정하지 않는다
+                    del self.pipelines[pipeline.hwnd]
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+        if dropped and self._on_failure is not None:
+            try:
+                self._on_failure(pipeline.hwnd, error)
+            except Exception as e:
+                self.logger.error("탐지 실패 처리 중 오류가 발생했습니다.", e)
+
+    def stats(self):
+        """창별 처리 프레임 수와 평균 탐지 시간"""
+        with self._condition:
+            return {
+                hwnd: {
+                    "role": p.role,
+                    "frames": p.frame_count,
+                    "busy_ms": p.busy_time * 1000,
+                    "average_ms": p.busy_time * 1000 / p.frame_count if p.frame_count else None,
+                }
+                for hwnd, p in self.pipelines.items()
+            }
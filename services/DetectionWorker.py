@@ -0,0 +1,91 @@
+"""
+QThread 에서 DetectionEngine 을 실행하고, DetectionScheduler 결과와 함께 Qt signal 로 UI 스레드에 전달한다.
+"""
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from services.DetectionEngine import DetectionEngine
+from services.LogService import LogHandler
+
+
+class DetectionWorker(QThread):
+    """
+    사용 예:
+        worker = DetectionWorker(screen_info, template_path, threshold=0.5, scales=[...])
+        worker.detected.connect(self.on_detected)      # UI 스레드에서 호출됨
+        worker.start()
+        worker.cancel()
+    """
+
+    detected = pyqtSignal(object)  # DetectionResult
+    progress = pyqtSignal(int, int)  # (처리한 프레임 수, 최대 프레임 수 - 0 이면 무제한)
+    failed = pyqtSignal(str)  # 오류 메시지
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, info, template_path, threshold=0.6, scales=[0.6, 0.8, 1.0, 1.2], target_fps=15,
+                 max_frames=None, start_delay=0.0, parent=None, **engine_options):
+        """
+        Args:
+            info (dict): 화면 캡처 영역 정보 (x, y, width, height).
+            template_path (str): 십자 모양 템플릿 이미지 경로.
+            threshold (float): 탐지 민감도.
+            scales (list): 템플릿 크기 조정 비율 리스트.
+            target_fps (float): 목표 초당 프레임 수.
+            max_frames (int): 처리할 최대 프레임 수. None 이면 cancel() 까지 계속.
+            start_delay (float): 탐지 시작 전 대기 시간 (창 전환 대기용, 취소 가능).
+            engine_options: DetectionEngine 추가 인자 (tracking, source, recorder 등).
+        """
+        super().__init__(parent)
+        self.max_frames = max_frames
+        self.start_delay = start_delay
+        self.engine = DetectionEngine(
+            info, template_path, threshold=threshold, scales=scales, target_fps=target_fps, **engine_options
+        )
+        self._cancelled = False
+
+    def run(self):
+        self._cancelled = False
+        try:
+            # UI 스레드 대신 작업 스레드에서 대기 (cancel() 시 즉시 깨어남)
+            if self.start_delay > 0 and self.engine._stop_event.wait(self.start_delay):
+                return
+
+            total = self.max_frames or 0
+            for result in self.engine.results(self.max_frames):
+                if self._cancelled:
+                    break
+                self.detected.emit(result)
+                self.progress.emit(result.frame_index, total)
+        except Exception as e:
+            self.logger.error("아이콘 탐지 중 오류가 발생했습니다.", e)
+            self.failed.emit(str(e))
+
+    def cancel(self, wait_ms=None):
+        """
+        탐지를 중지합니다. 현재 프레임 처리 후 스레드가 끝납니다.
+        Args:
+            wait_ms (int): 지정하면 스레드 종료를 최대 wait_ms 만큼 기다림.
+        """
+        self._cancelled = True
+        self.engine.stop()
+        if wait_ms is not None:
+            self.wait(wait_ms)
+
+
+class DetectionSchedulerSignals(QObject):
+    """
+    DetectionScheduler 작업 스레드의 결과를 Qt signal 로 UI 스레드에 전달한다.
+    사용 예:
+        signals = DetectionSchedulerSignals(parent=self)
+        signals.detected.connect(self.on_window_detected)    # UI 스레드에서 호출됨
+        scheduler.start(signals.emit_detected, on_failure=signals.emit_failed)
+    """
+
+    detected = pyqtSignal(object, object)  # (hwnd, DetectionResult)
+    failed = pyqtSignal(object, str)  # (hwnd, 오류 메시지) - 연속 실패로 등록 해제된 창
+
+    def emit_detected(self, hwnd, result):
+        self.detected.emit(hwnd, result)
+
+    def emit_failed(self, hwnd, error):
+        self.failed.emit(hwnd, str(error))
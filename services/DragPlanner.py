@@ -0,0 +1,126 @@
+"""
+드래그 경로 계획 - 거리에 맞춘 단계 수와 easing 곡선으로 경유 좌표와 전송 시각을 계산한다.
+"""
+import numpy as np
+
+
+def _linear(t):
+    return t
+
+
+def _ease_in_out(t):
+    """smoothstep - 시작/끝에서 느리고 가운데서 빠름"""
+    return t * t * (3.0 - 2.0 * t)
+
+
+def _ease_out(t):
+    """cubic ease-out - 빠르게 출발해서 목표 근처에서 감속"""
+    return 1.0 - (1.0 - t) ** 3
+
+
+def _ease_in_out_sine(t):
+    return 0.5 - 0.5 * np.cos(np.pi * t)
+
+
+EASINGS = {
+    "linear": _linear,
+    "ease_in_out": _ease_in_out,
+    "ease_out": _ease_out,
+    "ease_in_out_sine": _ease_in_out_sine,
+}
+
+
+class DragPath:
+    """계산된 드래그 경로: 이동 메시지별 좌표와 드래그 시작 기준 전송 시각 (초)"""
+
+    def __init__(self, start, end, xs, ys, times, duration):
+        self.start = start
+        self.end = end
+        self.xs = xs  # (N,) int32
+        self.ys = ys  # (N,) int32
+        self.times = times  # (N,) float64, 오름차순
+        self.duration = duration
+
+    def __len__(self):
+        return len(self.xs)
+
+
+class DragPlanner:
+    """
+    사용 예:
+        planner = DragPlanner(message_rate=125)
+        path = planner.plan((400, 300), (71, 55), duration=0.5, easing="ease_in_out")
+        dispatcher.submit(drag_plan(hwnd, (400, 300), (71, 55), planner=planner))
+    """
+
+    def __init__(self, message_rate=125.0, step_pixels=8.0, min_steps=2, max_steps=240, speed=2000.0,
+                 min_duration=0.05, max_duration=1.0, easing="ease_in_out"):
+        """
+        Args:
+            message_rate (float): 초당 최대 WM_MOUSEMOVE 수 (게임 창 메시지 큐를 넘치게 하지 않는 수준).
+            step_pixels (float): 한 단계 목표 이동 거리 (px). 짧은 드래그는 단계 수가 줄어든다.
+            min_steps, max_steps (int): 단계 수 범위.
+            speed (float): duration 을 지정하지 않았을 때 이동 속도 (px/초).
+            min_duration, max_duration (float): duration 을 지정하지 않았을 때 드래그 시간 범위 (초).
+            easing (str): 기본 easing 곡선 (EASINGS 키).
+        """
+        self.message_rate = message_rate
+        self.step_pixels = step_pixels
+        self.min_steps = min_steps
+        self.max_steps = max_steps
+        self.speed = speed
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.easing = easing
+
+    def duration_for(self, distance):
+        """지정하지 않은 드래그 시간을 거리 / 속도로 정합니다."""
+        return float(np.clip(distance / self.speed, self.min_duration, self.max_duration))
+
+    def steps_for(self, distance, duration):
+        """
+        단계 수 = 거리 / step_pixels, 단 duration 동안 message_rate 를 넘지 않고 [min_steps, max_steps] 범위.
+        """
+        by_distance = int(np.ceil(distance / self.step_pixels))
+        by_rate = int(duration * self.message_rate)
+        return int(np.clip(min(by_distance, by_rate), self.min_steps, self.max_steps))
+
+    def plan(self, start_pos, end_pos, duration=None, easing=None, steps=None):
+        """
+        드래그 경로를 계산합니다.
+        Args:
+            start_pos, end_pos (tuple): 시작 / 끝 좌표 (x, y).
+            duration (float): 드래그 시간 (초). 없으면 거리로 결정.
+            easing (str | callable): easing 곡선 이름 또는 [0, 1] → [0, 1] 함수.
+            steps (int): 단계 수를 직접 지정 (없으면 거리/전송률로 결정).
+        Returns:
+            DragPath: 이동 메시지 좌표와 전송 시각. 마지막 좌표는 항상 end_pos.
+        """
+        start = np.asarray(start_pos, dtype=np.float64)
+        end = np.asarray(end_pos, dtype=np.float64)
+        distance = float(np.hypot(*(end - start)))
+        if duration is None:
+            duration = self.duration_for(distance)
+        if steps is None:
+            steps = self.steps_for(distance, duration)
+
+        curve = easing or self.easing
+        curve = EASINGS[curve] if isinstance(curve, str) else curve
+
+        t = np.linspace(0.0, 1.0, steps + 1)[1:]  # 시작점은 버튼 누름 좌표이므로 제외
+        progress = curve(t)
+        points = np.rint(start + (end - start) * progress[:, None]).astype(np.int32)
+        times = t * duration
+
+        # 정수 좌표가 직전과 같은 메시지는 보내지 않는다 (짧은 드래그 / 느린 구간)
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+        keep[0] = np.any(points[0] != np.rint(start).astype(np.int32))
+        keep[-1] = True
+        points = points[keep]
+        times = times[keep]
+
+        return DragPath(tuple(start_pos), tuple(end_pos), points[:, 0], points[:, 1], times, duration)
+
+
+default_planner = DragPlanner()
@@ -0,0 +1,186 @@
+"""
+탐지 / 드래그 / 클릭 이벤트를 JSONL 로 기록한다 (monotonic_ns 시각, 크기 기준 파일 교체).
+공용 event_log 는 MACRO4DIA_EVENT_LOG=경로 또는 event_log.open(경로) 로 켠다.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+
+
+def _json_default(value):
+    """numpy 정수/실수 등은 파이썬 값으로, 나머지는 문자열로"""
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class EventLog:
+    """
+    사용 예:
+        events = EventLog("C:\\Dev\\Test\\events.jsonl")
+        events.click(hwnd, x, y)
+        events.close()
+    """
+
+    def __init__(self, path=None, max_bytes=64 * 1024 * 1024, backup_count=10, buffer_size=256 * 1024,
+                 flush_interval=1.0):
+        """
+        Args:
+            path (str): 기록 파일 경로. None 이면 open() 전까지 기록하지 않음.
+            max_bytes (int): 파일 하나의 최대 크기. 넘으면 다음 파일로 돌려 쓴다 (0 이면 돌려 쓰지 않음).
+            backup_count (int): 보관할 이전 파일 수.
+            buffer_size (int): 쓰기 버퍼 크기 (byte).
+            flush_interval (float): 마지막 flush 후 이 시간(초)이 지나면 다음 기록 때 flush.
+        """
+        self.path = None
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+
+        self._file = None
+        self._size = 0
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self.written = 0
+        if path:
+            self.open(path)
+
+    @property
+    def enabled(self):
+        return self._file is not None
+
+    def open(self, path):
+        """기록 파일을 엽니다 (이미 열려 있으면 닫고 새 경로로)."""
+        with self._lock:
+            self._close_file()
+            self.path = path
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._open_file()
+        return self
+
+    def _open_file(self):
+        self._file = open(self.path, "ab", buffering=self.buffer_size)
+        self._size = self._file.tell()
+        self._last_flush = time.monotonic()
+        # 파일마다 monotonic → 벽시계 환산 기준을 남긴다
+        self._write_line({"t": time.monotonic_ns(), "kind": "session", "wall_time": time.time(), "pid": os.getpid()})
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def record(self, kind, hwnd=None, **fields):
+        """
+        이벤트 하나를 기록합니다. 열려 있지 않으면 아무것도 하지 않습니다.
+        Args:
+            kind (str): 이벤트 종류 (detection, drag, click 등).
+            hwnd (int): 대상 창 핸들.
+            fields: 이벤트별 추가 값 (JSON 으로 변환 가능해야 함).
+        """
+        if self._file is None:
+            return
+        event = {"t": time.monotonic_ns(), "kind": kind}
+        if hwnd is not None:
+            event["hwnd"] = hwnd
+        event.update(fields)
+
+        with self._lock:
+            if self._file is None:
+                return
+            self._write_line(event)
+            self.written += 1
+            if self.max_bytes and self._size >= self.max_bytes:
+                self._rotate()
+            elif time.monotonic() - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def _write_line(self, event):
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=_json_default) + "\n"
+        data = line.encode("utf-8")
+        self._file.write(data)
+        self._size += len(data)
+
+    def _rotate(self):
+        """events.jsonl.N-1 → .N, ..., events.jsonl → .1 로 이름을 바꾸고 새 파일을 연다."""
+        self._close_file()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open_file()
+
+    def detection(self, hwnd, result):
+        """DetectionResult 한 프레임 기록 (좌표는 캡처 영역 기준)"""
+        self.record(
+            "detection",
+            hwnd,
+            frame=result.frame_index,
+            elapsed_ms=round(result.elapsed * 1000, 3),
+            skipped=getattr(result, "skipped", False),
+            points=[[d.x, d.y, round(float(d.score), 4)] for d in result.detections],
+        )
+
+    def drag(self, hwnd, start_pos, end_pos, duration=None, steps=None):
+        self.record("drag", hwnd, start=list(start_pos), end=list(end_pos), duration=duration, steps=steps)
+
+    def click(self, hwnd, x, y, button="left"):
+        self.record("click", hwnd, x=x, y=y, button=button)
+
+
+def read_events(path, kinds=None):
+    """
+    기록 파일을 오래된 것부터 (events.jsonl.N ... .1, events.jsonl) 순서대로 읽습니다.
+    Args:
+        path (str): 기록 파일 경로.
+        kinds (set): 지정하면 이 종류의 이벤트만.
+    Yields:
+        dict: 이벤트.
+    """
+    backups = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        backups.append(f"{path}.{index}")
+        index += 1
+    for file_path in list(reversed(backups)) + ([path] if os.path.exists(path) else []):
+        with open(file_path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue  # 비정상 종료로 잘린 마지막 줄
+                if kinds is None or event.get("kind") in kinds:
+                    yield event
+
+
+# 프로세스 공용 이벤트 기록기 (열기 전까지 비활성)
+event_log = EventLog(os.environ.get("MACRO4DIA_EVENT_LOG") or None)
+atexit.register(event_log.close)  # 버퍼에 남은 이벤트 저장
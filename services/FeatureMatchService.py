@@ -0,0 +1,234 @@
+"""
+특징점 매칭 - 템플릿 특징점을 디스크에 캐시하고 FLANN + ratio test 로 매칭한다 (SIFT / ORB / AKAZE).
+"""
+import hashlib
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from services.LogService import LogHandler
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".macro4dia", "feature_cache")
+
+# FLANN 인덱스 설정
+FLANN_INDEX_KDTREE = 1  # 실수 descriptor (SIFT)
+FLANN_INDEX_LSH = 6  # 이진 descriptor (ORB, AKAZE)
+
+
+def _create_detector(name, max_features):
+    if name == "sift":
+        return cv2.SIFT_create(nfeatures=max_features)
+    if name == "orb":
+        return cv2.ORB_create(nfeatures=max_features or 1000)
+    if name == "akaze":
+        if not hasattr(cv2, "AKAZE_create"):  # 일부 OpenCV 빌드는 AKAZE 를 포함하지 않는다
+            raise ValueError("현재 OpenCV 빌드에서 AKAZE 를 사용할 수 없습니다.")
+        return cv2.AKAZE_create()
+    raise ValueError(f"지원하지 않는 특징점 검출기입니다: {name}")
+
+
+class TemplateFeatures:
+    """템플릿 하나의 특징점 좌표 / descriptor / 학습된 FLANN matcher"""
+
+    def __init__(self, digest, points, descriptors, shape):
+        self.digest = digest
+        self.points = points  # (N, 2) float32 - 템플릿 특징점 좌표
+        self.descriptors = descriptors
+        self.shape = shape  # 템플릿 (H, W)
+        self.matcher = None
+
+
+class FeatureMatcher:
+    """
+    사용 예:
+        matcher = FeatureMatcher("orb")
+        found = matcher.match(captured_image, template_path)   # ((center_x, center_y), 외곽 좌표) 또는 None
+
+    FLANN matcher 는 스레드 간 공유하면 안 되므로 스레드마다 FeatureMatcher 를 하나씩 만든다.
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, detector="sift", cache_dir=DEFAULT_CACHE_DIR, ratio=0.75, min_matches=10,
+                 ransac_threshold=5.0, max_features=0):
+        """
+        Args:
+            detector (str): 특징점 검출기 - "sift" | "orb" | "akaze".
+            cache_dir (str): 템플릿 특징점 디스크 캐시 폴더. None 이면 메모리 캐시만 사용.
+            ratio (float): Lowe ratio test 기준 (1순위 거리 < ratio * 2순위 거리).
+            min_matches (int): 위치 계산에 필요한 최소 매칭 수.
+            ransac_threshold (float): findHomography RANSAC 재투영 오차 (px).
+            max_features (int): 화면에서 추출할 최대 특징점 수 (0 = 검출기 기본값).
+        """
+        self.detector_name = detector
+        self.max_features = max_features
+        self.detector = _create_detector(detector, max_features)
+        self.binary = detector in ("orb", "akaze")
+        self.cache_dir = cache_dir
+        self.ratio = ratio
+        self.min_matches = min_matches
+        self.ransac_threshold = ransac_threshold
+
+        self._by_path = {}  # (path, mtime) -> digest
+        self._features = {}  # digest -> TemplateFeatures
+        self._lock = threading.Lock()
+
+    def _digest(self, template_path):
+        """템플릿 파일 내용 해시 (경로+수정시각이 같으면 다시 읽지 않음)"""
+        mtime = os.stat(template_path).st_mtime_ns
+        key = (template_path, mtime)
+        digest = self._by_path.get(key)
+        if digest is None:
+            with open(template_path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            self._by_path[key] = digest
+        return digest
+
+    def _cache_path(self, digest):
+        # 검출기 설정이 다르면 템플릿 특징점도 달라지므로 파일 이름에 포함
+        return os.path.join(self.cache_dir, f"{digest}_{self.detector_name}_{self.max_features}.npz")
+
+    def template_features(self, template_path):
+        """
+        템플릿 특징점을 반환합니다. 메모리 → 디스크 캐시 → 새로 계산 순으로 찾습니다.
+        Raises:
+            FileNotFoundError: 템플릿 파일을 읽을 수 없는 경우.
+        """
+        try:
+            digest = self._digest(template_path)
+        except OSError:
+            raise FileNotFoundError(f"템플릿 파일을 찾을 수 없습니다: {template_path}")
+
+        with self._lock:
+            features = self._features.get(digest)
+            if features is not None:
+                return features
+
+            features = self._load_cached(digest)
+            if features is None:
+                features = self._compute(template_path, digest)
+                self._save_cached(features)
+
+            features.matcher = self._build_matcher(features.descriptors)
+            self._features[digest] = features
+            if len(features.descriptors) < self.min_matches:
+                # match() 는 이 템플릿에 대해 항상 None 을 반환한다 (템플릿을 읽을 때 한 번만 알림)
+                self.logger.warn(
+                    f"템플릿 특징점이 부족합니다 ({len(features.descriptors)} < {self.min_matches}).", template_path
+                )
+            return features
+
+    def _compute(self, template_path, digest):
+        template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+        if template is None:
+            raise FileNotFoundError(f"템플릿 파일을 찾을 수 없습니다: {template_path}")
+        keypoints, descriptors = self.detector.detectAndCompute(template, None)
+        points = np.float32([kp.pt for kp in keypoints]).reshape(-1, 2)
+        if descriptors is None:
+            # descriptor 폭은 검출기마다 다르다 (ORB 32 byte, AKAZE 61 byte, SIFT 128 float)
+            descriptors = np.empty(
+                (0, self.detector.descriptorSize()), np.uint8 if self.binary else np.float32
+            )
+        return TemplateFeatures(digest, points, descriptors, template.shape[:2])
+
+    def _load_cached(self, digest):
+        if not self.cache_dir:
+            return None
+        path = self._cache_path(digest)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return TemplateFeatures(digest, data["points"], data["descriptors"], tuple(data["shape"]))
+        except Exception as e:
+            self.logger.warn("특징점 캐시를 읽을 수 없어 다시 계산합니다.", path, e)
+            return None
+
+    def _save_cached(self, features):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.savez(
+                self._cache_path(features.digest),
+                points=features.points,
+                descriptors=features.descriptors,
+                shape=np.asarray(features.shape),
+            )
+        except OSError as e:
+            self.logger.warn("특징점 캐시를 저장할 수 없습니다.", e)
+
+    def _build_matcher(self, descriptors):
+        """템플릿 descriptor 로 FLANN 인덱스를 한 번만 학습한다."""
+        if self.binary:
+            index_params = dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1)
+        else:
+            index_params = dict(algorithm=FLANN_INDEX_KDTREE, trees=5)
+        matcher = cv2.FlannBasedMatcher(index_params, dict(checks=50))
+        if len(descriptors):
+            matcher.add([descriptors])
+            matcher.train()
+        return matcher
+
+    def match(self, captured_image, template_path):
+        """
+        캡처된 화면에서 템플릿 위치를 찾습니다.
+        Args:
+            captured_image (numpy.ndarray): BGR 또는 BGRA 화면.
+            template_path (str): 템플릿 이미지 경로.
+        Returns:
+            tuple: ((center_x, center_y), 템플릿 외곽 4점 좌표), 찾지 못하면 None.
+        """
+        features = self.template_features(template_path)
+        if len(features.descriptors) < self.min_matches:
+            return None
+
+        if captured_image.ndim == 3 and captured_image.shape[2] == 4:
+            captured_image = cv2.cvtColor(captured_image, cv2.COLOR_BGRA2BGR)
+        keypoints, descriptors = self.detector.detectAndCompute(captured_image, None)
+        if descriptors is None or len(descriptors) < 2:
+            return None
+
+        # 화면 descriptor(query) 를 학습된 템플릿 인덱스(train) 에 질의 + ratio test
+        good_query, good_train = [], []
+        for pair in features.matcher.knnMatch(descriptors, k=2):
+            if len(pair) == 2 and pair[0].distance < self.ratio * pair[1].distance:
+                good_query.append(pair[0].queryIdx)
+                good_train.append(pair[0].trainIdx)
+
+        if len(good_query) < self.min_matches:
+            self.logger.debug(f"매칭된 특징점이 부족합니다: {len(good_query)}")
+            return None
+
+        frame_points = np.float32([keypoints[i].pt for i in good_query]).reshape(-1, 1, 2)
+        src_pts = features.points[good_train].reshape(-1, 1, 2)
+        matrix, _ = cv2.findHomography(src_pts, frame_points, cv2.RANSAC, self.ransac_threshold)
+        if matrix is None:
+            return None
+
+        h, w = features.shape
+        pts = np.float32([[0, 0], [0, h - 1], [w - 1, h - 1], [w - 1, 0]]).reshape(-1, 1, 2)
+        dst = cv2.perspectiveTransform(pts, matrix)
+        center_x = int(np.mean(dst[:, 0, 0]))
+        center_y = int(np.mean(dst[:, 0, 1]))
+        return (center_x, center_y), dst
+
+
+def feature_matcher_factory(template_path, scales, threshold, detector="sift"):
+    """ProcessDetectionBackend(detector_factory=...) 용 탐지 함수 (scales / threshold 미사용)"""
+    from services.MatchFilter import Detection
+
+    matcher = FeatureMatcher(detector)
+
+    def detect(frame):
+        found = matcher.match(frame, template_path)
+        if found is None:
+            return []
+        (center_x, center_y), _ = found
+        h, w = matcher.template_features(template_path).shape
+        return [Detection(center_x, center_y, 1.0, 1.0, w, h)]
+
+    return detect
@@ -0,0 +1,159 @@
+"""
+프레임 변화 감지 - 이전 프레임과 비교해 탐지 생략 / 변한 영역만 탐지 / 전체 탐지를 결정한다.
+"""
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+
+# 한 프레임의 변화 판단 결과
+#   changed (bool): 변화가 있는지 여부
+#   full (bool): 전체 화면을 다시 탐지해야 하는지 여부
+#   regions (list): 변한 영역 [(x1, y1, x2, y2), ...] (원본 프레임 좌표, full 이면 빈 리스트)
+#   ratio (float): 변한 타일 비율
+FrameChange = namedtuple("FrameChange", ["changed", "full", "regions", "ratio"])
+
+
+class FrameChangeGate:
+    """
+    사용 예:
+        gate = FrameChangeGate(tile_size=64)
+        change = gate.check(frame)
+        if not change.changed:
+            ...  # 이전 탐지 결과 재사용
+        elif change.full:
+            ...  # 전체 화면 탐지
+        else:
+            ...  # change.regions 만 탐지
+    스레드마다 별도 인스턴스를 사용해야 한다 (썸네일 버퍼 재사용).
+    """
+
+    def __init__(self, tile_size=64, downscale=4, pixel_threshold=16, tile_threshold=0.002, full_ratio=0.5,
+                 max_regions=8, full_interval=120):
+        """
+        Args:
+            tile_size (int): 변화 판단 타일 크기 (원본 px).
+            downscale (int): 비교용 썸네일 축소 배수.
+            pixel_threshold (int): 썸네일 밝기 차이가 이 값을 넘으면 변한 픽셀로 본다 (압축/노이즈 무시).
+            tile_threshold (float): 타일 안에서 변한 픽셀 비율이 이 값을 넘으면 변한 타일로 본다.
+            full_ratio (float): 변한 타일 비율이 이 값 이상이면 전체 화면 탐지.
+            max_regions (int): 변한 영역이 이보다 많으면 영역별 탐지 대신 전체 화면 탐지.
+            full_interval (int): 이 프레임 수 동안 전체 탐지가 없었으면 강제로 전체 화면 탐지
+                (임계값 아래로 천천히 바뀌는 화면 대비, 0 이면 사용 안 함).
+        """
+        self.tile_size = tile_size
+        self.downscale = max(1, downscale)
+        self.pixel_threshold = pixel_threshold
+        self.tile_threshold = tile_threshold
+        self.full_ratio = full_ratio
+        self.max_regions = max_regions
+        self.full_interval = full_interval
+
+        self._shape = None
+        self._thumb = None
+        self._previous = None
+        self._diff = None
+        self._has_previous = False
+        self._since_full = 0
+
+        self.frames = 0
+        self.unchanged_frames = 0
+        self.partial_frames = 0
+        self.full_frames = 0
+
+    def reset(self):
+        """이전 프레임을 잊고 다음 프레임을 전체 화면 탐지로 처리합니다."""
+        self._has_previous = False
+
+    def _ensure_buffers(self, height, width):
+        if self._shape == (height, width):
+            return
+        self._shape = (height, width)
+        thumb_h = max(1, height // self.downscale)
+        thumb_w = max(1, width // self.downscale)
+        self._thumb = np.empty((thumb_h, thumb_w), dtype=np.uint8)
+        self._previous = np.empty((thumb_h, thumb_w), dtype=np.uint8)
+        self._diff = np.empty((thumb_h, thumb_w), dtype=np.uint8)
+        self._has_previous = False
+
+    def _make_thumbnail(self, frame):
+        """프레임을 축소한 뒤 Grayscale 로 변환 (축소를 먼저 해서 변환 비용을 줄인다)."""
+        thumb_h, thumb_w = self._thumb.shape
+        small = cv2.resize(frame, (thumb_w, thumb_h), interpolation=cv2.INTER_AREA)
+        if small.ndim == 2:
+            np.copyto(self._thumb, small)
+        else:
+            code = cv2.COLOR_BGRA2GRAY if small.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            cv2.cvtColor(small, code, dst=self._thumb)
+
+    def check(self, frame):
+        """
+        이전 프레임과 비교해 변화 여부를 판단하고, 현재 프레임을 다음 비교 기준으로 저장합니다.
+        Args:
+            frame (numpy.ndarray): BGRA / BGR / Grayscale 화면.
+        Returns:
+            FrameChange: 변화 판단 결과.
+        """
+        height, width = frame.shape[:2]
+        self._ensure_buffers(height, width)
+        self._make_thumbnail(frame)
+        self.frames += 1
+
+        self._since_full += 1
+        if not self._has_previous or (self.full_interval and self._since_full >= self.full_interval):
+            self._thumb, self._previous = self._previous, self._thumb
+            self._has_previous = True
+            return self._full(1.0)
+
+        cv2.absdiff(self._thumb, self._previous, dst=self._diff)
+        # 이번 썸네일이 다음 비교 기준 (버퍼 교체로 복사 없음)
+        self._thumb, self._previous = self._previous, self._thumb
+
+        dirty = self._dirty_tiles(height, width)
+        ratio = float(np.count_nonzero(dirty)) / dirty.size
+        if ratio == 0.0:
+            self.unchanged_frames += 1
+            return FrameChange(False, False, [], 0.0)
+        if ratio >= self.full_ratio:
+            return self._full(ratio)
+
+        regions = self._dirty_regions(dirty, height, width)
+        if len(regions) > self.max_regions:
+            return self._full(ratio)
+        self.partial_frames += 1
+        return FrameChange(True, False, regions, ratio)
+
+    def _full(self, ratio):
+        self._since_full = 0
+        self.full_frames += 1
+        return FrameChange(True, True, [], ratio)
+
+    def _dirty_tiles(self, height, width):
+        """타일별 변한 픽셀 비율을 구해 변한 타일 마스크 (rows, cols) 를 반환합니다."""
+        rows = -(-height // self.tile_size)
+        cols = -(-width // self.tile_size)
+        changed = (self._diff > self.pixel_threshold).astype(np.float32)
+        # INTER_AREA 축소 = 타일 영역 평균 (변한 픽셀 비율)
+        tile_ratio = cv2.resize(changed, (cols, rows), interpolation=cv2.INTER_AREA)
+        return (tile_ratio > self.tile_threshold).astype(np.uint8)
+
+    def _dirty_regions(self, dirty, height, width):
+        """이웃한 변한 타일을 묶어 원본 좌표 사각형 리스트로 반환합니다."""
+        count, _, stats, _ = cv2.connectedComponentsWithStats(dirty, connectivity=8)
+        regions = []
+        for left, top, cols, rows, _ in stats[1:count]:
+            x1 = int(left) * self.tile_size
+            y1 = int(top) * self.tile_size
+            x2 = min(width, int(left + cols) * self.tile_size)
+            y2 = min(height, int(top + rows) * self.tile_size)
+            regions.append((x1, y1, x2, y2))
+        return regions
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "unchanged": self.unchanged_frames,
+            "partial": self.partial_frames,
+            "full": self.full_frames,
+        }
@@ -0,0 +1,267 @@
+"""
+캡처 프레임 녹화 / 재생.
+폴더 하나가 세션 하나: session.json (메타), index.bin (프레임 레코드), chunk_NNNNN.bin (원본 픽셀, memory-map 가능).
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from services.FrameSource import FrameSource
+from services.LogService import LogHandler
+
+
+FORMAT_VERSION = 1
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("chunk", "<u4"),  # 청크 파일 번호
+        ("offset", "<u8"),  # 청크 내 시작 위치 (byte)
+        ("height", "<u4"),
+        ("width", "<u4"),
+        ("channels", "<u4"),
+        ("timestamp", "<f8"),  # 캡처 시각 (time.time)
+        ("hwnd", "<u8"),  # 창 핸들 (없으면 0)
+        ("x", "<i4"),  # 창 좌표 / 크기 (WindowsService.get_adjusted_window_info)
+        ("y", "<i4"),
+        ("window_width", "<i4"),
+        ("window_height", "<i4"),
+    ]
+)
+
+
+def _chunk_path(path, chunk):
+    return os.path.join(path, f"chunk_{chunk:05d}.bin")
+
+
+class FrameRecorder:
+    """
+    캡처 루프를 막지 않고 백그라운드 스레드에서 프레임을 저장한다.
+    사용 예:
+        recorder = FrameRecorder("C:\\Dev\\Test\\rec_001")
+        recorder.start()
+        recorder.record(frame, window_info=WindowsService.get_adjusted_window_info(hwnd))
+        recorder.stop()
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, path, chunk_bytes=256 * 1024 * 1024, max_queue=64, drop_alpha=False):
+        """
+        Args:
+            path (str): 녹화 세션 폴더 경로 (없으면 생성).
+            chunk_bytes (int): 청크 파일 최대 크기. 넘으면 다음 청크 파일로 넘어간다.
+            max_queue (int): 저장 대기 프레임 수 상한. 가득 차면 새 프레임은 버린다 (캡처 루프 보호).
+            drop_alpha (bool): BGRA 프레임의 알파 채널을 버리고 BGR 로 저장 (용량 25% 절감).
+        """
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.drop_alpha = drop_alpha
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+
+        self.recorded = 0
+        self.dropped = 0
+        self.failed = False  # 저장 스레드가 오류로 종료되었는지 여부
+
+    def start(self):
+        """녹화 스레드를 시작합니다."""
+        if self._thread is not None:
+            raise RuntimeError("녹화가 이미 시작되었습니다.")
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, "session.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "chunk_bytes": self.chunk_bytes, "created": time.time()}, f)
+
+        self._thread = threading.Thread(target=self._write_loop, name="FrameRecorder", daemon=True)
+        self._thread.start()
+        return self
+
+    def record(self, frame, timestamp=None, window_info=None):
+        """
+        프레임을 저장 대기열에 넣습니다. 대기열이 가득 찼거나 저장 스레드가 오류로 종료되었으면 버리고 False 를 반환합니다.
+        Args:
+            frame (numpy.ndarray): 캡처 프레임 (H, W, C). 내부에서 복사하므로 view 를 넘겨도 된다.
+            timestamp (float): 캡처 시각. 없으면 현재 시각.
+            window_info (dict): 창 정보 (hwnd, x, y, width, height).
+        Returns:
+            bool: 대기열에 넣었는지 여부.
+        """
+        if self._thread is None:
+            raise RuntimeError("녹화가 시작되지 않았습니다.")
+        if self.failed or self._queue.full():
+            self.dropped += 1
+            return False
+
+        item = (np.array(frame, copy=True), time.time() if timestamp is None else timestamp, window_info or {})
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def stop(self, timeout=None):
+        """대기 중인 프레임을 모두 저장하고 녹화 스레드를 종료합니다."""
+        if self._thread is None:
+            return
+        # 저장 스레드가 오류로 먼저 종료되었으면 대기열이 가득 찬 채로 남으므로 막히지 않게 넣는다
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self._thread.join(timeout)
+        self._thread = None
+        self.logger.info(f"녹화 종료: {self.recorded} 프레임 저장, {self.dropped} 프레임 버림 ({self.path})")
+
+    def _write_loop(self):
+        chunk = 0
+        chunk_file = open(_chunk_path(self.path, chunk), "ab")
+        index_file = open(os.path.join(self.path, "index.bin"), "ab")
+        offset = chunk_file.tell()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                frame, timestamp, window_info = item
+                if self.drop_alpha and frame.ndim == 3 and frame.shape[2] == 4:
+                    frame = np.ascontiguousarray(frame[:, :, :3])
+                if frame.ndim == 2:
+                    frame = frame[:, :, np.newaxis]
+
+                if offset > 0 and offset + frame.nbytes > self.chunk_bytes:
+                    chunk_file.close()
+                    chunk += 1
+                    chunk_file = open(_chunk_path(self.path, chunk), "ab")
+                    offset = chunk_file.tell()
+
+                chunk_file.write(frame.data)
+                chunk_file.flush()
+
+                record = np.zeros(1, dtype=INDEX_DTYPE)
+                record["chunk"] = chunk
+                record["offset"] = offset
+                record["height"], record["width"], record["channels"] = frame.shape
+                record["timestamp"] = timestamp
+                record["hwnd"] = int(window_info.get("hwnd") or 0)
+                record["x"] = window_info.get("x", 0)
+                record["y"] = window_info.get("y", 0)
+                record["window_width"] = window_info.get("width", frame.shape[1])
+                record["window_height"] = window_info.get("height", frame.shape[0])
+                index_file.write(record.tobytes())
+                index_file.flush()
+
+                offset += frame.nbytes
+                self.recorded += 1
+        except Exception as e:
+            self.failed = True
+            self.logger.error("프레임 저장 중 오류가 발생했습니다.", e)
+        finally:
+            chunk_file.close()
+            index_file.close()
+
+
+class FrameRecording:
+    """
+    녹화 세션을 memory-map 으로 읽는다. recording[i] 로 임의 프레임에 바로 접근한다 (복사 없음).
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): 녹화 세션 폴더 경로.
+        """
+        self.path = path
+        with open(os.path.join(path, "session.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 녹화 형식 버전입니다: {self.meta.get('version')}")
+
+        index_path = os.path.join(path, "index.bin")
+        count = os.path.getsize(index_path) // INDEX_DTYPE.itemsize if os.path.exists(index_path) else 0
+        self.index = np.fromfile(index_path, dtype=INDEX_DTYPE, count=count) if count else np.zeros(0, INDEX_DTYPE)
+        self._chunks = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def _chunk(self, chunk):
+        mapped = self._chunks.get(chunk)
+        if mapped is None:
+            mapped = np.memmap(_chunk_path(self.path, chunk), dtype=np.uint8, mode="r")
+            self._chunks[chunk] = mapped
+        return mapped
+
+    def __getitem__(self, frame_index):
+        """
+        Args:
+            frame_index (int): 프레임 번호 (음수 가능).
+        Returns:
+            numpy.ndarray: (H, W, C) 읽기 전용 view.
+        """
+        record = self.index[frame_index]
+        height, width, channels = int(record["height"]), int(record["width"]), int(record["channels"])
+        start = int(record["offset"])
+        data = self._chunk(int(record["chunk"]))[start:start + height * width * channels]
+        return data.reshape(height, width, channels)
+
+    def frame_info(self, frame_index):
+        """프레임의 캡처 시각과 창 정보를 반환합니다."""
+        record = self.index[frame_index]
+        return {
+            "timestamp": float(record["timestamp"]),
+            "hwnd": int(record["hwnd"]),
+            "x": int(record["x"]),
+            "y": int(record["y"]),
+            "width": int(record["window_width"]),
+            "height": int(record["window_height"]),
+        }
+
+    def close(self):
+        self._chunks.clear()
+
+
+class RecordingFrameSource(FrameSource):
+    """녹화 세션을 FrameSource 로 재생 (DetectionEngine(source=...) 에 사용)."""
+
+    def __init__(self, path, start=0, stop=None, loop=False):
+        """
+        Args:
+            path (str): 녹화 세션 폴더 경로.
+            start, stop (int): 재생할 프레임 범위.
+            loop (bool): 끝나면 처음부터 반복.
+        """
+        self.path = path
+        self.start = start
+        self.stop = stop
+        self.loop = loop
+        self.recording = None
+        self.position = start
+
+    def open(self):
+        if self.recording is None:
+            self.recording = FrameRecording(self.path)
+        self.position = self.start
+        return self
+
+    def read(self):
+        if self.recording is None:
+            self.open()
+        stop = len(self.recording) if self.stop is None else min(self.stop, len(self.recording))
+        if self.position >= stop:
+            if not self.loop or stop <= self.start:
+                return None
+            self.position = self.start
+        frame = self.recording[self.position]
+        self.position += 1
+        return frame
+
+    def close(self):
+        if self.recording is not None:
+            self.recording.close()
+            self.recording = None
@@ -0,0 +1,283 @@
+"""
+프레임 소스 - 실시간 캡처(mss / BitBlt)와 녹화 재생(이미지 폴더, 동영상, raw 덤프)을 같은 방식으로 읽는다.
+"""
+import glob
+import os
+
+import cv2
+import numpy as np
+
+from services.LogService import LogHandler
+from services.MetricsService import metrics
+
+
+class FrameSource:
+    """프레임 소스 기본 클래스"""
+
+    logger = LogHandler("FIND")
+
+    def open(self):
+        """캡처 세션 / 파일을 엽니다."""
+        return self
+
+    def read(self):
+        """
+        다음 프레임을 반환합니다.
+        Returns:
+            numpy.ndarray: BGRA 또는 BGR 프레임, 끝이면 None.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """열린 자원을 정리합니다."""
+        pass
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+
+class MssFrameSource(FrameSource):
+    """mss 화면 캡처 (세션 유지). ScreenShot 버퍼를 복사 없이 BGRA 배열로 감싼다."""
+
+    def __init__(self, monitor):
+        """
+        Args:
+            monitor (dict): mss 캡처 영역 {"top", "left", "width", "height"}.
+        """
+        self.monitor = monitor
+        self._sct = None
+
+    def open(self):
+        import mss
+
+        if self._sct is None:
+            self._sct = mss.mss()
+        return self
+
+    def read(self):
+        if self._sct is None:
+            self.open()
+        with metrics.timer("capture", backend="mss"):
+            shot = self._sct.grab(self.monitor)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+
+class BitBltFrameSource(FrameSource):
+    """GDI BitBlt 로 특정 창을 캡처 (TargetSearchService.capture_window 와 같은 방식, DC/비트맵 재사용)."""
+
+    def __init__(self, hwnd):
+        """
+        Args:
+            hwnd (int): 캡처할 창 핸들.
+        """
+        self.hwnd = hwnd
+        self._size = None
+        self._hwnd_dc = None
+        self._mfc_dc = None
+        self._save_dc = None
+        self._bitmap = None
+
+    def open(self):
+        import win32gui
+        import win32ui
+
+        self._hwnd_dc = win32gui.GetWindowDC(self.hwnd)
+        self._mfc_dc = win32ui.CreateDCFromHandle(self._hwnd_dc)
+        self._save_dc = self._mfc_dc.CreateCompatibleDC()
+        return self
+
+    def _ensure_bitmap(self, width, height):
+        """창 크기가 바뀐 경우에만 비트맵을 다시 만든다."""
+        import win32gui
+        import win32ui
+
+        if self._size == (width, height):
+            return
+        if self._bitmap is not None:
+            win32gui.DeleteObject(self._bitmap.GetHandle())
+        self._bitmap = win32ui.CreateBitmap()
+        self._bitmap.CreateCompatibleBitmap(self._mfc_dc, width, height)
+        self._save_dc.SelectObject(self._bitmap)
+        self._size = (width, height)
+
+    def read(self):
+        import win32con
+        import win32gui
+
+        if self._save_dc is None:
+            self.open()
+        left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
+        width, height = right - left, bottom - top
+        if width <= 0 or height <= 0:
+            return None
+
+        self._ensure_bitmap(width, height)
+        with metrics.timer("capture", backend="bitblt"):
+            self._save_dc.BitBlt((0, 0), (width, height), self._mfc_dc, (0, 0), win32con.SRCCOPY)
+            bits = self._bitmap.GetBitmapBits(True)
+        return np.frombuffer(bits, dtype=np.uint8).reshape(height, width, 4)
+
+    def close(self):
+        import win32gui
+
+        if self._bitmap is not None:
+            win32gui.DeleteObject(self._bitmap.GetHandle())
+            self._bitmap = None
+        if self._save_dc is not None:
+            self._save_dc.DeleteDC()
+            self._save_dc = None
+        if self._mfc_dc is not None:
+            self._mfc_dc.DeleteDC()
+            self._mfc_dc = None
+        if self._hwnd_dc is not None:
+            win32gui.ReleaseDC(self.hwnd, self._hwnd_dc)
+            self._hwnd_dc = None
+        self._size = None
+
+
+class ImageDirectoryFrameSource(FrameSource):
+    """폴더의 이미지 파일을 이름순으로 재생."""
+
+    def __init__(self, directory, pattern="*.png", loop=False, preload=False):
+        """
+        Args:
+            directory (str): 이미지 폴더 경로.
+            pattern (str): 파일 패턴.
+            loop (bool): 끝나면 처음부터 반복.
+            preload (bool): 미리 모두 디코딩해 메모리에 올림 (측정 시 디코딩 비용 제외).
+        """
+        self.paths = sorted(glob.glob(os.path.join(directory, pattern)))
+        self.loop = loop
+        self.preload = preload
+        self._images = None
+        self._index = 0
+
+    def open(self):
+        self._index = 0
+        if self.preload and self._images is None:
+            self._images = [self._load(path) for path in self.paths]
+        return self
+
+    @staticmethod
+    def _load(path):
+        image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if image is not None and image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return image
+
+    def read(self):
+        if not self.paths:
+            return None
+        if self._index >= len(self.paths):
+            if not self.loop:
+                return None
+            self._index = 0
+
+        index = self._index
+        self._index += 1
+        if self._images is not None:
+            return self._images[index]
+        return self._load(self.paths[index])
+
+    def __len__(self):
+        return len(self.paths)
+
+
+class VideoFrameSource(FrameSource):
+    """동영상 파일 재생 (cv2.VideoCapture). 디코딩 결과는 같은 버퍼에 덮어쓴다."""
+
+    def __init__(self, path, loop=False):
+        """
+        Args:
+            path (str): 동영상 파일 경로.
+            loop (bool): 끝나면 처음부터 반복.
+        """
+        self.path = path
+        self.loop = loop
+        self._capture = None
+        self._buffer = None
+
+    def open(self):
+        if self._capture is None:
+            self._capture = cv2.VideoCapture(self.path)
+            if not self._capture.isOpened():
+                self._capture = None
+                raise FileNotFoundError(f"동영상 파일을 열 수 없습니다: {self.path}")
+        return self
+
+    def read(self):
+        if self._capture is None:
+            self.open()
+        ok, frame = self._capture.read(self._buffer)
+        if not ok and self.loop:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._capture.read(self._buffer)
+        if not ok:
+            return None
+        self._buffer = frame
+        return frame
+
+    def close(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+class RawDumpFrameSource(FrameSource):
+    """고정 크기 raw 프레임을 이어 붙인 덤프 파일을 memory-map 으로 재생 (복사 없음)."""
+
+    def __init__(self, path, width, height, channels=4, loop=False):
+        """
+        Args:
+            path (str): raw 덤프 파일 경로.
+            width, height (int): 프레임 크기.
+            channels (int): 채널 수 (mss 캡처는 4, BGRA).
+            loop (bool): 끝나면 처음부터 반복.
+        """
+        self.path = path
+        self.shape = (height, width, channels)
+        self.loop = loop
+        self._frames = None
+        self._index = 0
+
+    def open(self):
+        if self._frames is None:
+            frame_size = int(np.prod(self.shape))
+            count = os.path.getsize(self.path) // frame_size
+            self._frames = np.memmap(self.path, dtype=np.uint8, mode="r", shape=(count,) + self.shape)
+        self._index = 0
+        return self
+
+    def read(self):
+        if self._frames is None:
+            self.open()
+        if self._index >= len(self._frames):
+            if not self.loop or len(self._frames) == 0:
+                return None
+            self._index = 0
+        frame = self._frames[self._index]
+        self._index += 1
+        return frame
+
+    def __len__(self):
+        if self._frames is None:
+            self.open()
+        return len(self._frames)
+
+    def close(self):
+        self._frames = None
@@ -1,18 +1,15 @@
+import logging
+
 import cv2
 import numpy as np
-import mss
-import time
-import pyautogui
-import keyboard
-import cv2
-import numpy as np
-import mss
-import time
-import win32api
-import win32con, win32gui
 
-from main.SendEventTest import send_click_to_window
 from services.LogService import  LogHandler
+from services.TemplateService import TemplateRegistry
+from services.MatchFilter import CONTAINMENT_THRESHOLD, extract_peaks, merge_scale_matches, non_max_suppression
+from services.PreprocessService import GreenMaskPipeline
+from services.FrameSource import MssFrameSource
+from services.MatchExecutor import MatchExecutor
+from services.MetricsService import metrics
 
 """
 신클래스
@@ -21,11 +18,101 @@ from services.LogService import  LogHandler
 class IconDetector:
 
     logger = LogHandler("FIND")
+    template_registry = TemplateRegistry()  # 템플릿 캐시 (인스턴스 간 공유)
     
-    def __init__(self):
-        pass
+    def __init__(self, matcher=None, workers=0):
+        """
+        Args:
+            matcher: 전체 화면 매칭 엔진 (예: CoarseToFineMatcher). 없으면 원본 해상도 매칭.
+            workers (int): 스케일별 매칭을 나눠 실행할 스레드 수. 0/1 이면 순차 실행.
+        """
+        self.matcher = matcher
+        self.preprocessor = GreenMaskPipeline()  # 캡처 크기별 버퍼 재사용 (인스턴스별, 스레드 공유 금지)
+        self.executor = MatchExecutor.shared(workers) if workers and workers > 1 else None
 
-        
+    def match(self, gray_frame, resized_templates, threshold=0.6, iou_threshold=0.3):
+        """전체 화면 템플릿 매칭. matcher 가 지정되어 있으면 matcher 에 위임합니다."""
+        if self.matcher is not None:
+            return self.matcher.match(gray_frame, resized_templates, threshold, iou_threshold)
+        return self._match_templates(gray_frame, resized_templates, threshold, iou_threshold)
+
+    @staticmethod
+    def _match_one(gray_frame, resized_template, threshold, scale=None):
+        """
+        템플릿 하나를 매칭하고 지역 최대값(peak)을 반환합니다. 화면보다 큰 템플릿은 None.
+        scale 은 계측 라벨 용도입니다.
+        """
+        h, w = resized_template.shape
+        if h > gray_frame.shape[0] or w > gray_frame.shape[1]:
+            return None  # 화면보다 큰 템플릿은 매칭 불가
+
+        # **[2] 템플릿 매칭 실행**
+        with metrics.timer("match_template", scale=scale):
+            result = cv2.matchTemplate(gray_frame, resized_template, cv2.TM_CCOEFF_NORMED)
+
+        # **[3] 지역 최대값(peak)만 추출**
+        with metrics.timer("peak_extraction", scale=scale):
+            xs, ys, scores = extract_peaks(result, threshold, w, h)
+        return w, h, xs, ys, scores
+
+    def _match_templates(self, gray_frame, resized_templates, threshold=0.6, iou_threshold=0.3):
+        """
+        모든 스케일의 템플릿을 매칭하고 객체당 하나의 탐지 결과만 남깁니다.
+        workers 가 지정되어 있으면 스케일별 매칭을 스레드 풀에서 병렬로 실행합니다 (결과 순서는 동일).
+
+        Args:
+            gray_frame (numpy.ndarray): Grayscale 변환된 화면.
+            resized_templates (TemplateSet | list): 크기 조정된 템플릿 이미지 리스트.
+            threshold (float): 탐지 민감도.
+            iou_threshold (float): 스케일 간 중복 제거(NMS) 겹침 기준.
+
+        Returns:
+            list: 점수 내림차순 Detection 리스트 (중심 좌표, 점수, 스케일 포함).
+        """
+        return self.match_multiple(gray_frame, [resized_templates], threshold, iou_threshold)[0]
+
+    def match_multiple(self, gray_frame, template_sets, threshold=0.6, iou_threshold=0.3):
+        """
+        여러 템플릿 묶음을 한 번에 매칭합니다. (템플릿, 스케일) 조합 전체를 스레드 풀에 나눠 실행합니다.
+
+        Args:
+            gray_frame (numpy.ndarray): Grayscale 변환된 화면.
+            template_sets (list): TemplateSet (또는 템플릿 리스트) 의 리스트.
+            threshold (float): 탐지 민감도.
+            iou_threshold (float): 스케일 간 중복 제거(NMS) 겹침 기준.
+
+        Returns:
+            list: template_sets 와 같은 순서의 Detection 리스트들.
+        """
+        jobs = [
+            (set_index, index, resized_template, self._scale_of(resized_templates, index))
+            for set_index, resized_templates in enumerate(template_sets)
+            for index, resized_template in enumerate(resized_templates)
+        ]
+
+        def run(job):
+            return self._match_one(gray_frame, job[2], threshold, job[3])
+
+        if self.executor is not None:
+            outputs = self.executor.map(run, jobs)
+        else:
+            outputs = [run(job) for job in jobs]
+
+        # 입력 순서대로 모으므로 병렬 실행 여부와 관계없이 결과가 같다
+        matches = [[] for _ in template_sets]
+        for (set_index, _, _, scale), output in zip(jobs, outputs):
+            if output is None:
+                continue
+            matches[set_index].append((scale,) + output)
+
+        # **[4] 스케일 간 중복 제거**
+        return [merge_scale_matches(set_matches, iou_threshold) for set_matches in matches]
+
+    @staticmethod
+    def _scale_of(resized_templates, index):
+        """TemplateSet 이면 실제 스케일, 템플릿 리스트면 인덱스"""
+        scales = getattr(resized_templates, "scales", None)
+        return scales[index] if scales is not None else index
 
     def _detect_green_crosses(self, gray_frame, resized_templates, threshold=0.6):
         """
@@ -35,28 +122,12 @@ class IconDetector:
             gray_frame (numpy.ndarray): Grayscale 변환된 화면.
             icon_templates (list): 크기 조정된 템플릿 이미지 리스트.
             threshold (float): 탐지 민감도.
-            min_size (int): 최소 크기 제한 (글자 등의 작은 요소 필터링).
         
         Returns:
             list: 탐지된 십자의 중심 좌표 리스트 [(center_x1, center_y1), (center_x2, center_y2), ...].
         """
-        detected_positions = []
-
-        for resized_template in resized_templates:
-           
-          
-            # **[2] 템플릿 매칭 실행**
-            result = cv2.matchTemplate(gray_frame, resized_template, cv2.TM_CCOEFF_NORMED)
-            locations = np.where(result >= threshold)
-
-            # **[3] 탐지된 위치 저장**
-            h, w = resized_template.shape
-            for pt in zip(*locations[::-1]):  # 템플릿과 일치하는 위치 찾기
-                center_x = pt[0] + w // 2
-                center_y = pt[1] + h // 2
-                detected_positions.append((center_x, center_y))
-
-        return detected_positions
+        detections = self.match(gray_frame, resized_templates, threshold)
+        return [(detection.x, detection.y) for detection in detections]
     
     def capture_screen_and_find_icons(self, info, template_path, threshold=0.6, scales=[0.6, 0.8, 1.0, 1.2]):
         """
@@ -71,13 +142,13 @@ class IconDetector:
         """
 
         self.logger.info("아이콘 탐지를 시작합니다.")
-        # **탐지할 아이콘 템플릿 로드 (+)**
-        icon_template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
-        if icon_template is None:
+        # **탐지할 아이콘 템플릿 로드 (+)** - 레지스트리에 캐시된 크기 변형본 사용
+        resized_templates = self.template_registry.get(template_path, scales)
+        if resized_templates is None:
             self.logger.error("탐지할 템플릿 이미지를 로드할 수 없습니다.")
             return []
-
-        resized_templates = [cv2.resize(icon_template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) for scale in scales]
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("템플릿 캐시:", self.template_registry.stats())
 
         # **화면 캡처 영역 설정**
         monitor = {"top": info['y'], "left": info['x'], "width": info['width'], "height": info['height']}
@@ -88,30 +159,12 @@ class IconDetector:
         monitor_center_y = monitor["top"] + monitor["height"] // 2
         self.logger.info(f"Center 좌표: ({monitor_center_x}, {monitor_center_y})")
 
-        with mss.mss() as sct:
-          # while True:
-                detected_positions = set()
-
+        with MssFrameSource(monitor) as source:
+          # while True:  → 연속 탐지는 services/DetectionEngine.DetectionEngine 사용
                 # **[1] 화면 캡처**
-                frame = np.array(sct.grab(monitor))
-             # 🎯 **BGRA → BGR 변환 (알파 채널 제거)**
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-
-                 # **[2] BGR → HSV 변환 후 녹색 필터링**
-                hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-                lower_green = np.array([40, 50, 50])  # 녹색 하한값
-                upper_green = np.array([85, 255, 255])  # 녹색 상한값
-        
-                green_mask = cv2.inRange(hsv, lower_green, upper_green)
-
-                # **[3] 녹색 영역만 남기고 배경 제거**
-                filtered_frame = cv2.bitwise_and(frame, frame, mask=green_mask)
-
-                # **[4] Grayscale 변환**
-                gray_frame = cv2.cvtColor(filtered_frame, cv2.COLOR_BGR2GRAY)
-
-                # **[3] 템플릿 매칭을 통해 아이콘 탐지**
-                detected_positions = self._detect_green_crosses(gray_frame, resized_templates, threshold)
+                frame = source.read()
+                frame, detections = self.detect_frame(frame, resized_templates, threshold)
+                detected_positions = [(detection.x, detection.y) for detection in detections]
 
                 self.logger.info(f"탐지된 아이콘 수: {len(detected_positions)}")
                 # **[4] 탐지된 십자 위치 화면에 표시**
@@ -129,6 +182,74 @@ class IconDetector:
         #cv2.destroyAllWindows()
         return detected_positions
 
+    def detect_frame(self, frame, resized_templates, threshold=0.6, tracker=None):
+        """
+        캡처된 한 프레임에서 녹색 십자(+) 아이콘을 탐지합니다.
+        Args:
+            frame (numpy.ndarray): mss 로 캡처한 BGRA 화면.
+            resized_templates (list): 크기 조정된 템플릿 이미지 리스트.
+            threshold (float): 탐지 민감도.
+            tracker (IconTracker): 지정하면 이전 탐지 위치 주변(ROI)만 매칭하는 추적 모드로 동작.
+        Returns:
+            tuple: (입력 화면, 점수 내림차순 Detection 리스트)
+        """
+        # **[1~4] HSV 녹색 필터링 + Grayscale 변환 (버퍼 재사용)**
+        gray_frame = self.preprocessor.process(frame)
+
+        # **[5] 템플릿 매칭을 통해 아이콘 탐지**
+        if tracker is not None:
+            detections = tracker.detect(gray_frame, resized_templates, threshold)
+        else:
+            detections = self.match(gray_frame, resized_templates, threshold)
+        return frame, detections
+
+    def detect_regions(self, frame, resized_templates, regions, previous, threshold=0.6, iou_threshold=0.3):
+        """
+        바뀐 영역만 다시 탐지하고 나머지는 이전 탐지 결과를 유지합니다 (FrameChangeGate 와 함께 사용).
+        직전 프레임을 이 탐지기로 처리했고, regions 밖은 바뀌지 않았어야 합니다.
+        Args:
+            frame (numpy.ndarray): mss 로 캡처한 BGRA 화면.
+            resized_templates (TemplateSet | list): 크기 조정된 템플릿 이미지 리스트.
+            regions (list): 바뀐 영역 [(x1, y1, x2, y2), ...].
+            previous (list): 직전 프레임의 Detection 리스트.
+            threshold (float): 탐지 민감도.
+            iou_threshold (float): 중복 제거(NMS) 겹침 기준.
+        Returns:
+            list: 점수 내림차순 Detection 리스트.
+        """
+        height, width = frame.shape[:2]
+        # 템플릿이 바뀐 영역에 걸칠 수 있는 범위까지 넓혀서 매칭
+        pad_w = max(template.shape[1] for template in resized_templates)
+        pad_h = max(template.shape[0] for template in resized_templates)
+        windows = [
+            (max(0, x1 - pad_w), max(0, y1 - pad_h), min(width, x2 + pad_w), min(height, y2 + pad_h))
+            for x1, y1, x2, y2 in regions
+        ]
+        gray_frame = self.preprocessor.process(frame, windows)
+
+        def overlaps(detection, region):
+            x1, y1, x2, y2 = region
+            half_w, half_h = detection.width // 2, detection.height // 2
+            return (detection.x - half_w < x2 and detection.x + half_w > x1
+                    and detection.y - half_h < y2 and detection.y + half_h > y1)
+
+        # 바뀐 영역에 걸친 이전 결과는 버리고, 새 결과는 바뀐 영역에 걸친 것만 채택
+        detections = [d for d in previous if not any(overlaps(d, region) for region in regions)]
+        for region, (wx1, wy1, wx2, wy2) in zip(regions, windows):
+            found = self._match_templates(gray_frame[wy1:wy2, wx1:wx2], resized_templates, threshold, iou_threshold)
+            for detection in found:
+                detection = detection._replace(x=detection.x + wx1, y=detection.y + wy1)
+                if overlaps(detection, region):
+                    detections.append(detection)
+
+        if len(detections) < 2:
+            return detections
+        boxes = np.array([
+            [d.x - d.width // 2, d.y - d.height // 2, d.x + d.width // 2, d.y + d.height // 2] for d in detections
+        ])
+        scores = np.array([d.score for d in detections])
+        return [detections[i] for i in non_max_suppression(boxes, scores, iou_threshold, CONTAINMENT_THRESHOLD)]
+
 """
 
 
@@ -0,0 +1,286 @@
+"""
+입력 이벤트 디스패처 - 클릭 / 드래그 메시지를 타이밍 스레드에서 예약된 시각에 보낸다.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import namedtuple
+
+from services.DragPlanner import default_planner
+from services.EventLogService import event_log
+from services.LogService import LogHandler
+from services.MetricsService import metrics
+
+
+# Win32 메시지 상수 (win32con 과 같은 값, Linux 에서도 계획을 만들 수 있도록 직접 정의)
+WM_MOUSEMOVE = 0x0200
+WM_LBUTTONDOWN = 0x0201
+WM_LBUTTONUP = 0x0202
+MK_LBUTTON = 0x0001
+
+MESSAGE_NAMES = {WM_MOUSEMOVE: "mousemove", WM_LBUTTONDOWN: "lbuttondown", WM_LBUTTONUP: "lbuttonup"}
+
+# 계획 안의 메시지 하나: 계획 시작 기준 지연 시간(초), 메시지, wParam, 창 내부 좌표
+InputEvent = namedtuple("InputEvent", ["delay", "message", "wparam", "x", "y"])
+
+
+class EventPlan:
+    """한 창에 보낼 시간순 메시지 묶음 (클릭 한 번, 드래그 한 번 등)"""
+
+    def __init__(self, hwnd, events, kind="input", **info):
+        """
+        Args:
+            hwnd (int): 대상 창 핸들.
+            events (list): delay 오름차순 InputEvent 리스트.
+            kind (str): 이벤트 기록용 종류 (click, drag 등).
+            info: 이벤트 기록에 함께 남길 값 (start, end, duration 등).
+        """
+        self.hwnd = hwnd
+        self.events = list(events)
+        self.kind = kind
+        self.info = info
+
+        self.scheduled_at = None  # 실제 시작 시각 (time.perf_counter)
+        self.sent = 0
+        self.pressed = None  # 버튼을 누른 채 마지막으로 보낸 좌표 (취소 시 버튼을 떼기 위해)
+        self.cancelled = False
+        self.error = None  # 전송 중 오류로 중단되었으면 그 예외
+        self._done = threading.Event()
+
+    @property
+    def duration(self):
+        return self.events[-1].delay if self.events else 0.0
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def wait(self, timeout=None):
+        """계획의 모든 메시지가 전송(또는 취소)될 때까지 기다립니다."""
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """남은 메시지를 보내지 않습니다. 버튼을 누른 상태였다면 디스패처가 버튼을 뗀다."""
+        self.cancelled = True
+
+
+def click_plan(hwnd, x, y, hold=0.1):
+    """버튼 누름 → hold 초 뒤 버튼 뗌"""
+    events = [
+        InputEvent(0.0, WM_LBUTTONDOWN, MK_LBUTTON, x, y),
+        InputEvent(hold, WM_LBUTTONUP, 0, x, y),
+    ]
+    return EventPlan(hwnd, events, "click", x=x, y=y)
+
+
+def drag_plan(hwnd, start_pos, end_pos, duration=None, easing=None, steps=None, planner=None):
+    """
+    버튼 누름 → DragPlanner 가 계산한 경유 좌표로 이동 → 버튼 뗌.
+    Args:
+        duration (float): 드래그 시간 (초). 없으면 거리로 결정.
+        easing (str | callable): easing 곡선. 없으면 planner 기본값.
+        steps (int): 단계 수 직접 지정 (없으면 거리와 목표 메시지 전송률로 결정).
+        planner (DragPlanner): 경로 계산기. 없으면 default_planner.
+    """
+    path = (planner or default_planner).plan(start_pos, end_pos, duration, easing, steps)
+    start_x, start_y = (int(round(v)) for v in start_pos)
+    end_x, end_y = (int(round(v)) for v in end_pos)
+
+    events = [InputEvent(0.0, WM_LBUTTONDOWN, MK_LBUTTON, start_x, start_y)]
+    events.extend(
+        InputEvent(delay, WM_MOUSEMOVE, MK_LBUTTON, x, y)
+        for delay, x, y in zip(path.times.tolist(), path.xs.tolist(), path.ys.tolist())
+    )
+    events.append(InputEvent(path.duration, WM_LBUTTONUP, 0, end_x, end_y))
+    return EventPlan(
+        hwnd, events, "drag", start=list(start_pos), end=list(end_pos), duration=path.duration, steps=len(path)
+    )
+
+
+class Win32PostMessageBackend:
+    """win32api.PostMessage 로 창에 메시지를 보낸다 (운영 환경)."""
+
+    def __init__(self):
+        import win32api
+
+        self._post = win32api.PostMessage
+        self._make_long = win32api.MAKELONG
+
+    def post(self, hwnd, message, wparam, x, y):
+        self._post(hwnd, message, wparam, self._make_long(int(x), int(y)))
+
+
+class RecordingBackend:
+    """보낸 메시지를 (전송 시각, hwnd, 메시지, wParam, x, y) 로 기록만 한다 (Linux 테스트 / 재생 확인용)."""
+
+    def __init__(self):
+        self.messages = []
+        self._lock = threading.Lock()
+
+    def post(self, hwnd, message, wparam, x, y):
+        with self._lock:
+            self.messages.append((time.perf_counter(), hwnd, message, wparam, x, y))
+
+    def clear(self):
+        with self._lock:
+            self.messages = []
+
+
+class InputDispatcher:
+    """
+    사용 예:
+        dispatcher = InputDispatcher()                       # 기본 backend: Win32 PostMessage
+        plan = dispatcher.submit(drag_plan(hwnd, start, end, duration=0.5))
+        ...                                                  # 드래그 진행 중에도 탐지 계속
+        plan.wait()                                          # 필요할 때만 완료 대기
+        dispatcher.stop()
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: post(hwnd, message, wparam, x, y) 를 가진 전송 객체. 없으면 Win32PostMessageBackend.
+        """
+        self.backend = backend if backend is not None else Win32PostMessageBackend()
+        self._heap = []  # (전송 시각, 순번, plan, event)
+        self._sequence = itertools.count()
+        self._busy_until = {}  # hwnd -> 마지막 계획이 끝나는 시각
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="InputDispatcher", daemon=True)
+        self._thread.start()
+
+        self.late_events = 0  # 예정 시각보다 늦게 보낸 메시지 수 (>2ms)
+
+    def submit(self, plan):
+        """
+        계획을 예약하고 바로 반환합니다. 같은 창의 이전 계획이 끝난 뒤 시작합니다.
+        Returns:
+            EventPlan: 넘겨받은 계획 (wait() / cancel() 용).
+        """
+        if not plan.events:
+            plan._done.set()
+            return plan
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("입력 디스패처가 종료되었습니다.")
+            now = time.perf_counter()
+            start = max(now, self._busy_until.get(plan.hwnd, 0.0))
+            plan.scheduled_at = start
+            self._busy_until[plan.hwnd] = start + plan.duration
+            for event in plan.events:
+                heapq.heappush(self._heap, (start + event.delay, next(self._sequence), plan, event))
+            self._condition.notify()
+        return plan
+
+    def click(self, hwnd, x, y, hold=0.1):
+        return self.submit(click_plan(hwnd, x, y, hold))
+
+    def drag(self, hwnd, start_pos, end_pos, duration=None, easing=None, steps=None, planner=None):
+        return self.submit(drag_plan(hwnd, start_pos, end_pos, duration, easing, steps, planner))
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._heap:
+                        if self._stopping:
+                            return
+                        self._condition.wait()
+                        continue
+                    due = self._heap[0][0]
+                    remaining = due - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                _, _, plan, event = heapq.heappop(self._heap)
+            # 전송은 lock 밖에서 (submit 이 전송을 기다리지 않도록)
+            try:
+                self._dispatch(plan, event, due)
+            except Exception as e:
+                # 기록 / 계측 오류로 타이밍 스레드가 죽으면 이후 모든 계획이 전송되지 않으므로 이 계획만 실패 처리
+                self.logger.error(f"입력 이벤트 처리 중 오류가 발생했습니다. HWND {plan.hwnd}", e)
+                self._fail(plan, e)
+
+    def _fail(self, plan, error):
+        """계획의 남은 메시지를 보내지 않고 끝냅니다 (누른 버튼은 뗌)."""
+        if plan.error is None:
+            plan.error = error
+        plan.cancel()
+        plan.sent += 1
+        if plan.sent >= len(plan.events):
+            plan._done.set()
+
+    def _dispatch(self, plan, event, due):
+        last = plan.sent + 1 == len(plan.events)
+        if plan.cancelled:
+            if plan.pressed is not None:
+                self._post(plan, WM_LBUTTONUP, 0, *plan.pressed)
+                plan.pressed = None
+            plan.sent += 1
+            if last:
+                plan._done.set()
+            return
+
+        if plan.sent == 0 and event_log.enabled:
+            event_log.record(plan.kind, plan.hwnd, **plan.info)
+        if time.perf_counter() - due > 0.002:
+            self.late_events += 1
+        self._post(plan, event.message, event.wparam, event.x, event.y)
+
+        if event.message == WM_LBUTTONUP:
+            plan.pressed = None
+        elif event.wparam & MK_LBUTTON:
+            plan.pressed = (event.x, event.y)
+        plan.sent += 1
+        if last:
+            plan._done.set()
+
+    def _post(self, plan, message, wparam, x, y):
+        try:
+            with metrics.timer("event_dispatch", event=MESSAGE_NAMES.get(message, message)):
+                self.backend.post(plan.hwnd, message, wparam, x, y)
+        except Exception as e:
+            self.logger.error(f"입력 이벤트 전송 중 오류가 발생했습니다. HWND {plan.hwnd}", e)
+
+    def pending(self):
+        """아직 보내지 않은 메시지 수"""
+        with self._condition:
+            return len(self._heap)
+
+    def stop(self, drain=True, timeout=None):
+        """
+        디스패처를 종료합니다.
+        Args:
+            drain (bool): True 면 예약된 메시지를 모두 보낸 뒤 종료, False 면 남은 계획을 취소 (누른 버튼은 뗌).
+        """
+        with self._condition:
+            self._stopping = True
+            if not drain:
+                for _, _, plan, _ in self._heap:
+                    plan.cancel()
+                # 취소된 계획은 시각과 관계없이 바로 정리
+                self._heap = [(0.0, sequence, plan, event) for _, sequence, plan, event in self._heap]
+                heapq.heapify(self._heap)
+            self._condition.notify()
+        self._thread.join(timeout)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """프로세스 공용 InputDispatcher (Win32 PostMessage backend, 처음 호출 시 생성)"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = InputDispatcher()
+        return _dispatcher
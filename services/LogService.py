@@ -1,4 +1,333 @@
+"""
+로거 설정 - 이름별 로거를 한 번만 설정하고 콘솔 / 파일 출력을 공유한다 (비동기 큐 출력 지원).
+"""
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+
+LOG_FORMAT = '%(name)s - %(asctime)s - %(levelname)s - %(message)s'
+LOG_FILE_NAME = 'macro4dia.log'
+LEGACY_LOG_DIR = "C:\\Dev\\Test"
+
+
+def _default_log_dir():
+    """MACRO4DIA_LOG_DIR → 기존 C:\\Dev\\Test (있으면) → ~/.macro4dia/logs 순으로 결정"""
+    log_dir = os.environ.get("MACRO4DIA_LOG_DIR")
+    if log_dir:
+        return log_dir
+    if os.path.isdir(LEGACY_LOG_DIR):
+        return LEGACY_LOG_DIR
+    return os.path.join(os.path.expanduser("~"), ".macro4dia", "logs")
+
+
+def _default_level():
+    """MACRO4DIA_LOG_LEVEL (DEBUG / INFO / ...) 가 없으면 DEBUG"""
+    level = logging.getLevelName(os.environ.get("MACRO4DIA_LOG_LEVEL", "DEBUG").upper())
+    return level if isinstance(level, int) else logging.DEBUG
+
+
+def _make_sink_handlers(log_path, console, handler_types):
+    """콘솔 / 파일 handler 를 만든다 (파일은 첫 기록 시 열림)."""
+    stream_type, file_type = handler_types
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [stream_type()] if console else []
+    if log_path:
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        handlers.append(file_type(log_path, encoding="utf-8", delay=True))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+ASYNC_LOGGING = True  # False 면 호출한 스레드에서 바로 출력 (이전 동작)
+MAX_QUEUE_SIZE = 10000  # 대기 중인 로그 레코드 최대 수
+OVERFLOW_POLICY = "drop_new"  # 큐가 가득 찼을 때: drop_new (새 레코드 버림) | drop_oldest (가장 오래된 레코드 버림) | block (대기)
+
+
+class _BatchFlushMixin:
+    """레코드마다 flush 하지 않고 listener 가 큐를 비운 뒤 flush_batch() 로 한 번에 flush 한다."""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+    def close(self):
+        self.flush_batch()
+        super().close()
+
+
+class _BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    pass
+
+
+class _BatchFileHandler(_BatchFlushMixin, logging.FileHandler):
+    pass
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차도 호출한 스레드를 막지 않는 QueueHandler"""
+
+    def __init__(self, log_queue, policy=OVERFLOW_POLICY):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+        self._exception_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        """
+        메시지와 예외 traceback 만 호출한 스레드에서 문자열로 바꾸고, Formatter 적용은 listener 스레드에 맡긴다
+        (QueueHandler.prepare 는 호출한 스레드에서 format 까지 한다).
+        메시지를 나중에 만들면 로그를 남긴 뒤 바뀐 리스트 / dict 의 내용이 찍힌다.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.policy == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+
+
+class _BatchQueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)  # 큐가 가득 차 있어도 종료 신호는 반드시 넣는다
+
+    def handle(self, record):
+        super().handle(record)
+        # 큐에 남은 레코드가 없을 때만 flush (몰려온 레코드는 한 번의 flush 로 묶인다)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush_batch()
+
+
+class AsyncLogWriter:
+    """
+    모든 LogHandler 가 공유하는 비동기 출력기 (콘솔 + 파일).
+    사용 예:
+        writer = AsyncLogWriter(log_path)
+        logger.addHandler(writer.queue_handler)
+        writer.stop()    # 남은 레코드를 모두 쓰고 종료
+    """
+
+    def __init__(self, log_path, max_queue=MAX_QUEUE_SIZE, policy=OVERFLOW_POLICY, console=True):
+        """
+        Args:
+            log_path (str): 로그 파일 경로. None 이면 파일에 쓰지 않음.
+            max_queue (int): 대기 중인 레코드 최대 수.
+            policy (str): 큐가 가득 찼을 때 정책 (drop_new | drop_oldest | block).
+            console (bool): 콘솔 출력 여부.
+        """
+        self.handlers = _make_sink_handlers(log_path, console, (_BatchStreamHandler, _BatchFileHandler))
+
+        self.queue = queue.Queue(max_queue)
+        self.queue_handler = BoundedQueueHandler(self.queue, policy)
+        self.listener = _BatchQueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self._lock = threading.Lock()
+        self._started = False
+
+    @property
+    def dropped(self):
+        return self.queue_handler.dropped
+
+    def start(self):
+        with self._lock:
+            if not self._started:
+                self.listener.start()
+                self._started = True
+        return self
+
+    def stop(self):
+        """큐에 남은 레코드를 모두 쓰고 listener 스레드를 종료합니다."""
+        with self._lock:
+            if not self._started:
+                return
+            self.listener.stop()
+            self._started = False
+        if self.dropped:
+            record = logging.makeLogRecord(
+                {"name": "LogService", "levelno": logging.WARNING, "levelname": "WARNING",
+                 "msg": f"로그 큐가 가득 차 {self.dropped}건의 로그를 버렸습니다."}
+            )
+            for handler in self.handlers:
+                handler.handle(record)
+        for handler in self.handlers:
+            handler.flush_batch()
+
+    def close(self):
+        """남은 레코드를 쓰고 파일을 닫습니다."""
+        self.stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+class _SinkDispatchHandler(logging.Handler):
+    """
+    모든 로거에 하나씩 붙는 handler. 레코드를 레지스트리의 현재 출력(sink)으로 넘긴다.
+    출력은 configure() 에서 만들고, 설정 전에 첫 레코드가 오면 기본 설정으로 만든다.
+    """
+
+    def __init__(self, registry):
+        super().__init__()
+        self.registry = registry
+
+    def handle(self, record):
+        # sink handler 가 각자 lock 을 잡으므로 여기서는 잡지 않는다
+        for handler in self.registry._sinks():
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def emit(self, record):
+        self.handle(record)
+
+
+class LoggerRegistry:
+    """
+    이름별 로거를 한 번만 설정하고 모든 로거가 출력(sink) 하나를 공유하게 한다.
+    import 만으로는 로그 폴더를 만들거나 listener 스레드를 시작하지 않는다 (configure_logging() 에서 시작).
+    사용 예:
+        configure_logging(log_dir="D:\\Logs", level=logging.DEBUG)   # 프로그램 시작 시 (생략하면 첫 로그 때 기본값으로)
+        logger = logger_registry.get("FIND")
+    """
+
+    def __init__(self, log_path=None, async_mode=ASYNC_LOGGING, level=None, console=True):
+        self.log_path = log_path
+        self.async_mode = async_mode
+        self.level = level if level is not None else _default_level()
+        self.console = console
+
+        self._loggers = {}  # name -> logging.Logger
+        self._dispatch = _SinkDispatchHandler(self)
+        self._sink_handlers = None  # configure() 에서 만든 출력 handler 리스트
+        self._writer = None
+        self._closed = False
+        self._lock = threading.RLock()
+
+    def get(self, name):
+        """설정된 로거를 반환합니다. 처음 요청된 이름만 handler 를 붙입니다."""
+        with self._lock:
+            logger = self._loggers.get(name)
+            if logger is None:
+                logger = logging.getLogger(name)
+                logger.setLevel(self.level)
+                logger.propagate = False  # root 에 handler 가 있어도 (basicConfig 등) 두 번 찍히지 않게
+                logger.addHandler(self._dispatch)
+                self._loggers[name] = logger
+            return logger
+
+    def _sinks(self):
+        handlers = self._sink_handlers
+        if handlers is not None:
+            return handlers
+        with self._lock:
+            if self._sink_handlers is None:
+                if self._closed:
+                    return []  # shutdown 이후 (프로세스 종료 중) 로그는 버린다
+                self._open_sinks()
+            return self._sink_handlers
+
+    def _open_sinks(self):
+        if not self.log_path:
+            self.log_path = os.path.join(_default_log_dir(), LOG_FILE_NAME)
+        if self.async_mode:
+            self._writer = AsyncLogWriter(self.log_path, console=self.console).start()
+            self._sink_handlers = [self._writer.queue_handler]
+        else:
+            self._sink_handlers = _make_sink_handlers(
+                self.log_path, self.console, (logging.StreamHandler, logging.FileHandler)
+            )
+
+    def configure(self, log_dir=None, log_path=None, async_mode=None, level=None, console=None):
+        """
+        로그 출력을 시작하거나 설정을 바꿉니다 (이미 만든 로거에도 적용).
+        로그 폴더 생성과 비동기 listener 스레드 시작은 여기서 한다.
+        Args:
+            log_dir (str): 로그 폴더 (파일 이름은 macro4dia.log).
+            log_path (str): 로그 파일 전체 경로 (log_dir 보다 우선).
+            async_mode (bool): 비동기 출력 여부.
+            level (int): 로그 레벨. 기본값은 DEBUG (환경 변수 MACRO4DIA_LOG_LEVEL=INFO 등으로 변경).
+            console (bool): 콘솔 출력 여부.
+        """
+        with self._lock:
+            self._close_sinks()
+            self._closed = False
+            if log_path or log_dir:
+                self.log_path = log_path or os.path.join(log_dir, LOG_FILE_NAME)
+            if async_mode is not None:
+                self.async_mode = async_mode
+            if level is not None:
+                self.level = level
+            if console is not None:
+                self.console = console
+
+            self._open_sinks()
+            for logger in self._loggers.values():
+                logger.setLevel(self.level)
+
+    def _close_sinks(self):
+        handlers = self._sink_handlers or []
+        self._sink_handlers = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        else:
+            for handler in handlers:
+                handler.close()
+
+    def shutdown(self):
+        """남은 로그를 모두 쓰고 파일을 닫습니다 (프로세스 종료 시 자동 호출)."""
+        with self._lock:
+            self._closed = True
+            self._close_sinks()
+
+    @property
+    def dropped(self):
+        """비동기 모드에서 큐가 가득 차 버린 레코드 수"""
+        return self._writer.dropped if self._writer is not None else 0
+
+
+# 프로세스 공용 로거 레지스트리
+logger_registry = LoggerRegistry()
+configure_logging = logger_registry.configure
+atexit.register(logger_registry.shutdown)
+
+
+def _join_args(args):
+    """인자를 공백으로 이어 붙인 메시지 (문자열은 그대로, 나머지는 str())"""
+    return " ".join(param if isinstance(param, str) else str(param) for param in args)
+
+
+class _LazyMessage:
+    """logging 이 레코드를 처리할 때 (getMessage) str() 로 메시지를 만든다."""
+
+    __slots__ = ("args",)
+
+    def __init__(self, args):
+        self.args = args
+
+    def __str__(self):
+        return _join_args(self.args)
+
 
 class LogHandler():
     logger = None
@@ -9,56 +338,35 @@ class LogHandler():
         self.name = name
         # 로그 생성
         self.nameReplace()
-        self.logger = logging.getLogger(self.name)
-
-        # 로그의 출력 기준 설정
-        self.logger.setLevel(logging.DEBUG)
-
-        # log 출력 형식
-        formatter = logging.Formatter('%(name)s - %(asctime)s - %(levelname)s - %(message)s')
-
-        # log를 console에 출력
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        self.logger.addHandler(stream_handler)
-
-        # log를 파일에 출력
-        file_handler = logging.FileHandler("C:\\Dev\\Test\\" + 'macro4dia.log')
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        # 이름별로 한 번만 설정된 로거 (콘솔/파일 출력은 모든 로거가 공유)
+        self.logger = logger_registry.get(self.name)
 
+    # 레벨이 꺼져 있으면 메시지를 만들지 않는다 (isEnabledFor 로 바로 반환).
+    # 켜져 있어도 메시지 문자열은 레코드가 handler 에 도달할 때 호출한 스레드에서 만든다 (_LazyMessage).
     def debug(self, *args):
-        self.logger.debug(self.messageConvert(args))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(_LazyMessage(args))
 
     def info(self, *args):
-        self.logger.info(self.messageConvert(args))
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(_LazyMessage(args))
 
     def warn(self, *args):
-        self.logger.warn(self.messageConvert(args))
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(_LazyMessage(args))
 
     def error(self, *args):
-        self.logger.error(self.messageConvert(args))
-
-    def messageConvert(self, *args):
-        message = str()
-        # 버그인가
-        args = args[0]
-
-        for param in args:
-            dType = type(param)
-            if not dType == "str":
-                # print("TYPE:" ,type(param))
-                if dType == "dict":
-                    pDict: dict = dict(param)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(_LazyMessage(args))
 
-                else:
-                    param = str(param)
+    def isEnabledFor(self, level):
+        """큰 구조를 로그로 남기기 전에 미리 확인할 때 사용 (예: isEnabledFor(logging.DEBUG))."""
+        return self.logger.isEnabledFor(level)
 
-            message += param + " "
-
-        return message
+    def messageConvert(self, *args):
+        return _join_args(args[0])
 
     # def getLogger(self):
     #   return self.logger
     def nameReplace(self):
-        self.name = self.name.replace("__", "")
\ No newline at end of file
+        self.name = self.name.replace("__", "")
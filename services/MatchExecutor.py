@@ -0,0 +1,54 @@
+"""
+스케일별 템플릿 매칭을 공용 스레드 풀에서 병렬 실행한다.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MatchExecutor:
+    """
+    순서가 보장되는 재사용 스레드 풀.
+    사용 예:
+        executor = MatchExecutor.shared(4)
+        results = executor.map(match_one, templates)   # 입력 순서대로 결과 반환
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int): 작업 스레드 수. 없으면 CPU 코어 수.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="MatchExecutor")
+
+    @classmethod
+    def shared(cls, workers=None):
+        """작업자 수가 같은 호출자끼리 공유하는 실행기를 반환합니다."""
+        workers = workers or os.cpu_count() or 1
+        with cls._shared_lock:
+            executor = cls._shared.get(workers)
+            if executor is None:
+                executor = cls(workers)
+                cls._shared[workers] = executor
+            return executor
+
+    def map(self, fn, items):
+        """
+        items 의 각 항목에 fn 을 병렬로 적용합니다.
+        Returns:
+            list: items 와 같은 순서의 결과 리스트 (완료 순서와 무관).
+        """
+        items = list(items)
+        if len(items) <= 1 or self.workers <= 1:
+            return [fn(item) for item in items]
+        return list(self._pool.map(fn, items))
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+        with self._shared_lock:
+            if self._shared.get(self.workers) is self:
+                del self._shared[self.workers]
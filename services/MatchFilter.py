@@ -0,0 +1,108 @@
+"""
+템플릿 매칭 결과 후처리 - 지역 최대값(peak) 추출과 스케일 간 NMS (IoU + 작은 박스 포함 비율).
+"""
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+
+# 탐지 결과 하나: 중심 좌표, 매칭 점수, 템플릿 스케일, 템플릿 크기
+Detection = namedtuple("Detection", ["x", "y", "score", "scale", "width", "height"])
+
+# 작은 박스 면적 대비 겹침 비율이 이 값보다 크면 같은 객체로 본다 (스케일 2배 이상 차이 나면 IoU 가 0.25 이하라 IoU 만으로는 못 걸러냄)
+CONTAINMENT_THRESHOLD = 0.7
+
+
+def extract_peaks(result, threshold, template_w, template_h):
+    """
+    matchTemplate 결과에서 threshold 이상인 지역 최대값만 추출합니다.
+    Args:
+        result (numpy.ndarray): cv2.matchTemplate 결과 (float32).
+        threshold (float): 탐지 민감도.
+        template_w, template_h (int): 템플릿 크기 (지역 최대값 탐색 창 크기 결정).
+    Returns:
+        tuple: (xs, ys, scores) - 좌상단 좌표와 점수 배열.
+    """
+    # 템플릿 크기의 절반 이내에서 가장 높은 점수만 peak 로 인정
+    kernel_w = max(3, (template_w // 2) | 1)
+    kernel_h = max(3, (template_h // 2) | 1)
+    kernel = np.ones((kernel_h, kernel_w), np.uint8)
+    dilated = cv2.dilate(result, kernel)
+
+    peak_mask = (result >= threshold) & (result >= dilated)
+    ys, xs = np.nonzero(peak_mask)
+    return xs, ys, result[ys, xs]
+
+
+def non_max_suppression(boxes, scores, iou_threshold=0.3, containment_threshold=None):
+    """
+    점수 순으로 겹치는 박스를 제거합니다 (IoU 계산은 벡터화).
+    Args:
+        boxes (numpy.ndarray): (N, 4) 배열 [x1, y1, x2, y2].
+        scores (numpy.ndarray): (N,) 점수 배열.
+        iou_threshold (float): 이 값보다 많이 겹치면 낮은 점수 박스를 제거.
+        containment_threshold (float): 겹친 면적 / 작은 박스 면적이 이 값보다 크면 제거 (큰 박스 안의 작은 박스).
+                                       None 이면 IoU 만 사용.
+    Returns:
+        numpy.ndarray: 남길 박스 인덱스 (점수 내림차순).
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    boxes = boxes.astype(np.float32, copy=False)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores, kind="stable")
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        inter_w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-6)
+        suppressed = iou > iou_threshold
+        if containment_threshold is not None:
+            suppressed |= inter / (np.minimum(areas[i], areas[rest]) + 1e-6) > containment_threshold
+
+        order = rest[~suppressed]
+
+    return np.asarray(keep, dtype=np.intp)
+
+
+def merge_scale_matches(matches, iou_threshold=0.3, containment_threshold=CONTAINMENT_THRESHOLD):
+    """
+    여러 스케일의 peak 를 합쳐 객체당 하나의 Detection 으로 정리합니다.
+    Args:
+        matches (list): [(scale, template_w, template_h, xs, ys, scores), ...]
+        iou_threshold (float): NMS 겹침 기준.
+        containment_threshold (float): 큰 스케일 박스 안에 들어간 작은 스케일 박스 제거 기준.
+    Returns:
+        list: 점수 내림차순 Detection 리스트.
+    """
+    matches = [m for m in matches if len(m[5]) > 0]
+    if not matches:
+        return []
+
+    xs = np.concatenate([m[3] for m in matches])
+    ys = np.concatenate([m[4] for m in matches])
+    scores = np.concatenate([m[5] for m in matches])
+    widths = np.concatenate([np.full(len(m[3]), m[1]) for m in matches])
+    heights = np.concatenate([np.full(len(m[3]), m[2]) for m in matches])
+    scale_index = np.concatenate([np.full(len(m[3]), i) for i, m in enumerate(matches)])
+
+    boxes = np.stack([xs, ys, xs + widths, ys + heights], axis=1)
+    keep = non_max_suppression(boxes, scores, iou_threshold, containment_threshold)
+
+    centers_x = xs[keep] + widths[keep] // 2
+    centers_y = ys[keep] + heights[keep] // 2
+    return [
+        Detection(int(cx), int(cy), float(score), matches[si][0], int(w), int(h))
+        for cx, cy, score, si, w, h in zip(
+            centers_x, centers_y, scores[keep], scale_index[keep], widths[keep], heights[keep]
+        )
+    ]
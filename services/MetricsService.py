@@ -0,0 +1,229 @@
+"""
+단계별 소요 시간 히스토그램 - JSON 스냅샷 / Prometheus 텍스트로 내보낸다.
+기본값은 꺼져 있다 (MACRO4DIA_METRICS=1 또는 metrics.enable()).
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+
+# 히스토그램 구간 상한 (초) - 0.1ms ~ 1s
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """고정 구간 히스토그램 (누적 아님, 마지막 칸은 +Inf)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """구간 상한 기준 근사 분위수 (초). 마지막 칸이면 최대값."""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "average_ms": self.sum * 1000 / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.5) * 1000,
+            "p99_ms": self.quantile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class _NullTimer:
+    """계측이 꺼져 있을 때 반환하는 아무 일도 하지 않는 timer"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ("registry", "key", "started")
+
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.registry._observe_key(self.key, time.perf_counter() - self.started)
+        return False
+
+
+class MetricsRegistry:
+    """단계(stage) + 라벨 조합별 소요 시간 히스토그램 모음"""
+
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            enabled (bool): 계측 사용 여부.
+            buckets (tuple): 히스토그램 구간 상한 (초).
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._histograms = {}  # (stage, ((label, value), ...)) -> Histogram
+        self._lock = threading.Lock()
+        self._server = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    @staticmethod
+    def _key(stage, labels):
+        return stage, tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def timer(self, stage, **labels):
+        """
+        with 블록 소요 시간을 기록하는 timer 를 반환합니다. 꺼져 있으면 아무것도 측정하지 않습니다.
+        Args:
+            stage (str): 단계 이름 (예: "capture", "match_template").
+            labels: 구분용 라벨 (예: scale=1.0).
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, self._key(stage, labels))
+
+    def observe(self, stage, seconds, **labels):
+        """이미 측정한 소요 시간 (초) 을 기록합니다."""
+        if self.enabled:
+            self._observe_key(self._key(stage, labels), seconds)
+
+    def _observe_key(self, key, seconds):
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def snapshot(self):
+        """
+        Returns:
+            list: [{"stage", "labels", "count", "sum", "average_ms", "p50_ms", "p99_ms", "max_ms", "buckets"}, ...]
+        """
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return [dict(stage=stage, labels=dict(labels), **histogram.snapshot()) for (stage, labels), histogram in items]
+
+    def write_snapshot(self, path):
+        """스냅샷을 JSON 파일로 저장합니다 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓴 파일을 보지 않는다)."""
+        data = {"timestamp": time.time(), "stages": self.snapshot()}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+
+    def export_periodically(self, path, interval=10.0):
+        """
+        interval 초마다 스냅샷을 파일로 저장하는 백그라운드 스레드를 시작합니다.
+        Returns:
+            threading.Event: set() 하면 마지막으로 한 번 저장하고 중지.
+        """
+        stop_event = threading.Event()
+
+        def run():
+            while not stop_event.wait(interval):
+                self.write_snapshot(path)
+            self.write_snapshot(path)
+
+        threading.Thread(target=run, name="MetricsExport", daemon=True).start()
+        return stop_event
+
+    def prometheus_text(self, prefix="macro4dia"):
+        """Prometheus 텍스트 형식 (histogram, 누적 bucket) 으로 변환합니다."""
+        name = f"{prefix}_stage_seconds"
+        lines = [f"# HELP {name} Pipeline stage duration in seconds.", f"# TYPE {name} histogram"]
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for (stage, labels), histogram in items:
+                label_text = ",".join([f'stage="{stage}"'] + [f'{k}="{v}"' for k, v in labels])
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{label_text}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9108, host="127.0.0.1"):
+        """
+        /metrics 경로로 Prometheus 텍스트를 제공하는 HTTP 서버를 백그라운드 스레드에서 시작합니다.
+        Returns:
+            ThreadingHTTPServer: 실행 중인 서버 (stop_serving() 으로 종료).
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        if self._server is not None:
+            return self._server
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 stderr 에 찍지 않는다
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True).start()
+        return self._server
+
+    def stop_serving(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# 프로세스 공용 계측 레지스트리
+metrics = MetricsRegistry(enabled=os.environ.get("MACRO4DIA_METRICS") == "1")
@@ -0,0 +1,124 @@
+"""
+녹색 마스크 전처리 - 캡처 크기별 버퍼를 재사용해 Grayscale 마스크 화면을 만든다.
+"""
+import time
+
+import cv2
+import numpy as np
+
+from services.MetricsService import metrics
+
+
+class GreenMaskPipeline:
+    """
+    캡처 화면(BGRA)에서 녹색 영역만 남긴 Grayscale 화면을 만든다.
+    반환 배열은 내부 버퍼이므로 다음 process() 호출 시 덮어써진다.
+    스레드마다 별도 인스턴스를 사용해야 한다.
+    """
+
+    # 녹색 범위 (HSV) - 매 프레임 np.array 를 새로 만들지 않도록 한 번만 생성
+    LOWER_GREEN = np.array([40, 50, 50], dtype=np.uint8)  # 녹색 하한값
+    UPPER_GREEN = np.array([85, 255, 255], dtype=np.uint8)  # 녹색 상한값
+
+    STAGES = ("hsv", "mask", "gray", "filter")
+
+    def __init__(self, lower_green=None, upper_green=None, timing=True):
+        """
+        Args:
+            lower_green, upper_green (numpy.ndarray): HSV 녹색 범위. 없으면 기본값.
+            timing (bool): 단계별 소요 시간 측정 여부.
+        """
+        self.lower_green = self.LOWER_GREEN if lower_green is None else np.asarray(lower_green, dtype=np.uint8)
+        self.upper_green = self.UPPER_GREEN if upper_green is None else np.asarray(upper_green, dtype=np.uint8)
+        self.timing = timing
+
+        self._shape = None
+        self._hsv = None
+        self._mask = None
+        self._gray = None
+        self._filtered = None
+
+        self.frames = 0
+        self.last_timings = dict.fromkeys(self.STAGES, 0.0)  # 마지막 프레임 단계별 시간 (초)
+        self.total_timings = dict.fromkeys(self.STAGES, 0.0)  # 누적 단계별 시간 (초)
+
+    def _ensure_buffers(self, height, width):
+        """캡처 크기가 바뀐 경우에만 버퍼를 새로 할당한다."""
+        if self._shape == (height, width):
+            return
+        self._shape = (height, width)
+        self._hsv = np.empty((height, width, 3), dtype=np.uint8)
+        self._mask = np.empty((height, width), dtype=np.uint8)
+        self._gray = np.empty((height, width), dtype=np.uint8)
+        self._filtered = np.empty((height, width), dtype=np.uint8)
+
+    def process(self, frame, regions=None):
+        """
+        녹색 영역만 남긴 Grayscale 화면을 만듭니다.
+        Args:
+            frame (numpy.ndarray): mss 로 캡처한 BGRA (또는 BGR) 화면.
+            regions (list): 지정하면 이 영역 [(x1, y1, x2, y2), ...] 만 다시 계산하고 나머지는 이전 결과를 유지
+                (직전 프레임과 크기가 같고 영역 밖이 바뀌지 않은 경우에만 사용).
+        Returns:
+            numpy.ndarray: 녹색만 남긴 Grayscale 화면 (내부 버퍼).
+        """
+        height, width = frame.shape[:2]
+        if regions is not None and self._shape == (height, width):
+            for x1, y1, x2, y2 in regions:
+                # 버퍼의 같은 위치 view 에 직접 쓴다 (dst= 는 ROI view 도 그대로 사용)
+                self._process_into(frame[y1:y2, x1:x2], (slice(y1, y2), slice(x1, x2)))
+            self.frames += 1
+            return self._filtered
+
+        self._ensure_buffers(height, width)
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        gray_code = cv2.COLOR_BGRA2GRAY if channels == 4 else cv2.COLOR_BGR2GRAY
+
+        if not self.timing and not metrics.enabled:
+            # BGR2HSV 는 4채널 입력을 받으므로 BGRA→BGR 변환을 생략한다
+            cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self._hsv)
+            cv2.inRange(self._hsv, self.lower_green, self.upper_green, dst=self._mask)
+            cv2.cvtColor(frame, gray_code, dst=self._gray)
+            cv2.bitwise_and(self._gray, self._mask, dst=self._filtered)  # mask 는 0/255
+            self.frames += 1
+            return self._filtered
+
+        t0 = time.perf_counter()
+        cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self._hsv)
+        t1 = time.perf_counter()
+        cv2.inRange(self._hsv, self.lower_green, self.upper_green, dst=self._mask)
+        t2 = time.perf_counter()
+        cv2.cvtColor(frame, gray_code, dst=self._gray)
+        t3 = time.perf_counter()
+        cv2.bitwise_and(self._gray, self._mask, dst=self._filtered)
+        t4 = time.perf_counter()
+
+        self._record(hsv=t1 - t0, mask=t2 - t1, gray=t3 - t2, filter=t4 - t3)
+        if metrics.enabled:
+            metrics.observe("color_conversion", t1 - t0, step="hsv")
+            metrics.observe("masking", t2 - t1, step="in_range")
+            metrics.observe("color_conversion", t3 - t2, step="gray")
+            metrics.observe("masking", t4 - t3, step="bitwise_and")
+        return self._filtered
+
+    def _process_into(self, frame, window):
+        gray_code = cv2.COLOR_BGRA2GRAY if frame.ndim == 3 and frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self._hsv[window])
+        cv2.inRange(self._hsv[window], self.lower_green, self.upper_green, dst=self._mask[window])
+        cv2.cvtColor(frame, gray_code, dst=self._gray[window])
+        cv2.bitwise_and(self._gray[window], self._mask[window], dst=self._filtered[window])
+
+    def _record(self, **timings):
+        self.frames += 1
+        self.last_timings = timings
+        for stage, elapsed in timings.items():
+            self.total_timings[stage] += elapsed
+
+    def stats(self):
+        """단계별 평균 소요 시간 (ms) 을 반환합니다."""
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "average_ms": {stage: total * 1000 / frames for stage, total in self.total_timings.items()},
+            "last_ms": {stage: elapsed * 1000 for stage, elapsed in self.last_timings.items()},
+        }
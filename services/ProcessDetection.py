@@ -0,0 +1,212 @@
+"""
+프로세스 풀 탐지 백엔드 - 프레임은 shared_memory 링 슬롯으로 넘기고 작업 프로세스에서 탐지한다.
+"""
+import os
+import queue
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from services.LogService import LogHandler
+
+
+def icon_detector_factory(template_path, scales, threshold):
+    """IconDetector 기반 탐지 함수 (기본값)"""
+    from services.ImageSearch import IconDetector
+
+    detector = IconDetector()
+
+    def detect(frame):
+        resized_templates = detector.template_registry.get(template_path, scales)
+        if resized_templates is None:
+            raise FileNotFoundError(f"템플릿 파일을 찾을 수 없습니다: {template_path}")
+        _, detections = detector.detect_frame(frame, resized_templates, threshold)
+        return detections
+
+    return detect
+
+
+def _attach_shared_memory(name):
+    """작업 프로세스에서 공유 메모리에 연결 (resource tracker 가 대신 해제하지 않도록 추적 제외)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python 3.12 이하
+        return shared_memory.SharedMemory(name=name)
+
+
+# 작업 프로세스 전역 상태 (initializer 에서 한 번만 준비)
+_worker_state = {}
+
+
+def _worker_init(shm_name, slot_bytes, detector_factory, template_path, scales, threshold):
+    _worker_state["shm"] = _attach_shared_memory(shm_name)
+    _worker_state["slot_bytes"] = slot_bytes
+    _worker_state["detect"] = detector_factory(template_path, scales, threshold)
+
+
+def _worker_detect(slot, shape, frame_index):
+    """슬롯의 프레임을 복사 없이 읽어 탐지합니다."""
+    shm = _worker_state["shm"]
+    frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * _worker_state["slot_bytes"])
+    try:
+        detections = _worker_state["detect"](frame)
+    finally:
+        del frame  # 공유 메모리 view 를 남기지 않는다 (close 시 BufferError 방지)
+    return frame_index, list(detections)
+
+
+class SharedFrameRing:
+    """고정 크기 슬롯 N 개로 나눈 공유 메모리 링 버퍼"""
+
+    def __init__(self, slots, slot_bytes):
+        """
+        Args:
+            slots (int): 슬롯 수 (= 동시에 처리 중일 수 있는 최대 프레임 수).
+            slot_bytes (int): 슬롯 하나의 크기 (가장 큰 프레임 크기 이상).
+        """
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        self._free = queue.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def acquire(self, timeout=None):
+        """빈 슬롯 번호를 얻습니다. timeout 안에 없으면 None."""
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def release(self, slot):
+        self._free.put(slot)
+
+    def write(self, slot, frame):
+        """프레임을 슬롯에 복사하고 (shape) 를 반환합니다."""
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"프레임이 슬롯보다 큽니다: {frame.nbytes} > {self.slot_bytes}")
+        target = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+        np.copyto(target, frame)
+        del target
+        return frame.shape
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ProcessDetectionBackend:
+    """
+    사용 예:
+        backend = ProcessDetectionBackend(template_path, scales, threshold, max_frame_shape=(1080, 1920, 4))
+        with backend:
+            for frame_index, detections in backend.map_frames(source):
+                ...
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, template_path, scales=[0.6, 0.8, 1.0, 1.2], threshold=0.6, max_frame_shape=(1080, 1920, 4),
+                 processes=None, slots=None, detector_factory=icon_detector_factory):
+        """
+        Args:
+            template_path (str): 십자 모양 템플릿 이미지 경로.
+            scales (list): 템플릿 크기 조정 비율 리스트.
+            threshold (float): 탐지 민감도.
+            max_frame_shape (tuple): 처리할 가장 큰 프레임 (H, W, C) - 슬롯 크기 결정.
+            processes (int): 작업 프로세스 수. 없으면 CPU 코어 수.
+            slots (int): 링 슬롯 수. 없으면 작업 프로세스 수 x 2 (캡처와 탐지가 겹치도록).
+            detector_factory (callable): 작업 프로세스에서 탐지 함수를 만드는 모듈 최상위 함수.
+        """
+        self.template_path = template_path
+        self.scales = list(scales)
+        self.threshold = threshold
+        self.slot_bytes = int(np.prod(max_frame_shape))
+        self.processes = processes or os.cpu_count() or 1
+        self.slots = slots or self.processes * 2
+        self.detector_factory = detector_factory
+
+        self.ring = None
+        self._pool = None
+        self.submitted = 0
+        self.dropped = 0
+
+    def start(self):
+        if self._pool is not None:
+            return self
+        self.ring = SharedFrameRing(self.slots, self.slot_bytes)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_worker_init,
+            initargs=(self.ring.name, self.slot_bytes, self.detector_factory, self.template_path, self.scales, self.threshold),
+        )
+        self.logger.info(f"프로세스 탐지 시작: 작업 프로세스 {self.processes}개, 슬롯 {self.slots}개")
+        return self
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, frame, frame_index, timeout=None):
+        """
+        프레임을 빈 슬롯에 쓰고 작업 프로세스에 탐지를 요청합니다.
+        Args:
+            frame (numpy.ndarray): (H, W, C) uint8 프레임.
+            frame_index (int): 결과와 함께 돌려받을 프레임 번호.
+            timeout (float): 빈 슬롯을 기다릴 최대 시간. 0 이면 기다리지 않고 프레임을 버린다.
+        Returns:
+            Future: (frame_index, detections) 를 결과로 가지는 Future, 버렸으면 None.
+        """
+        if self._pool is None:
+            self.start()
+        slot = self.ring.acquire(timeout=timeout)
+        if slot is None:
+            self.dropped += 1
+            return None
+
+        try:
+            shape = self.ring.write(slot, np.ascontiguousarray(frame))
+            future = self._pool.submit(_worker_detect, slot, shape, frame_index)
+        except Exception:
+            self.ring.release(slot)
+            raise
+        # 작업이 끝나면(성공/실패 모두) 슬롯 반환
+        future.add_done_callback(lambda _, slot=slot: self.ring.release(slot) if self.ring is not None else None)
+        self.submitted += 1
+        return future
+
+    def map_frames(self, frames):
+        """
+        프레임을 순서대로 제출하고 결과를 제출 순서대로 돌려줍니다. 동시에 처리 중인 프레임은 슬롯 수 이하.
+        Args:
+            frames (iterable): 프레임 iterable (예: FrameSource).
+        Yields:
+            tuple: (frame_index, detections)
+        """
+        pending = deque()
+        for frame_index, frame in enumerate(frames):
+            # 슬롯이 모두 사용 중이면 가장 오래된 결과부터 받아 자리를 비운다
+            while len(pending) >= self.slots:
+                yield pending.popleft().result()
+            pending.append(self.submit(frame, frame_index))
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,134 @@
+"""
+Coarse-to-fine 피라미드 매칭 - 축소 화면에서 후보를 찾고 원본 해상도에서는 후보 주변만 다시 매칭한다.
+"""
+import cv2
+import numpy as np
+
+from services.LogService import LogHandler
+from services.MatchFilter import extract_peaks, merge_scale_matches
+from services.TemplateService import TemplateRegistry
+
+
+class CoarseToFineMatcher:
+    """
+    IconDetector 의 선택적 매칭 엔진.
+    사용 예:
+        detector = IconDetector(matcher=CoarseToFineMatcher(levels=2))
+
+    recall / 속도 조절:
+        levels        - 축소 단계 (1 = 1/2, 2 = 1/4). 클수록 빠르지만 작은 아이콘을 놓칠 수 있다.
+        coarse_ratio  - 축소 화면 후보 기준 = threshold * coarse_ratio. 낮을수록 recall 증가, 정밀 매칭 증가.
+        max_candidates - 스케일별 정밀 매칭 후보 수 상한.
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, levels=1, coarse_ratio=0.8, max_candidates=64, min_template_size=6, registry=None):
+        """
+        Args:
+            levels (int): 피라미드 축소 단계 수 (축소 배율 2 ** levels).
+            coarse_ratio (float): 축소 화면에서 사용할 threshold 비율.
+            max_candidates (int): 스케일별 원본 해상도 확인 후보 최대 수.
+            min_template_size (int): 축소 후 템플릿이 이보다 작으면 해당 스케일은 원본 해상도로 바로 매칭.
+            registry (TemplateRegistry): 축소 템플릿 캐시. 없으면 전용 레지스트리 생성.
+        """
+        self.levels = levels
+        self.coarse_ratio = coarse_ratio
+        self.max_candidates = max_candidates
+        self.min_template_size = min_template_size
+        self.registry = registry if registry is not None else TemplateRegistry()
+
+    @property
+    def factor(self):
+        return 2 ** self.levels
+
+    def match(self, gray_frame, resized_templates, threshold=0.6, iou_threshold=0.3):
+        """
+        IconDetector._match_templates 와 같은 형식으로 탐지 결과를 반환합니다.
+        Args:
+            gray_frame (numpy.ndarray): 녹색만 남긴 Grayscale 화면.
+            resized_templates (TemplateSet | list): 크기 조정된 템플릿 이미지 리스트.
+            threshold (float): 탐지 민감도.
+            iou_threshold (float): 스케일 간 중복 제거(NMS) 겹침 기준.
+        Returns:
+            list: 점수 내림차순 Detection 리스트.
+        """
+        factor = self.factor
+        scales = getattr(resized_templates, "scales", None)
+        frame_h, frame_w = gray_frame.shape[:2]
+
+        small_frame = self._downsample(gray_frame, factor)
+        small_templates = self._small_templates(resized_templates, factor)
+
+        matches = []
+        for index, template in enumerate(resized_templates):
+            h, w = template.shape
+            if h > frame_h or w > frame_w:
+                continue
+            scale = scales[index] if scales is not None else index
+
+            small_template = small_templates[index]
+            sh, sw = small_template.shape
+            if min(sh, sw) < self.min_template_size or sh > small_frame.shape[0] or sw > small_frame.shape[1]:
+                # 축소하면 형태가 사라지는 작은 템플릿: 원본 해상도에서 직접 매칭
+                result = cv2.matchTemplate(gray_frame, template, cv2.TM_CCOEFF_NORMED)
+                xs, ys, scores = extract_peaks(result, threshold, w, h)
+                matches.append((scale, w, h, xs, ys, scores))
+                continue
+
+            # **[1] 축소 화면에서 후보 탐색**
+            coarse = cv2.matchTemplate(small_frame, small_template, cv2.TM_CCOEFF_NORMED)
+            cxs, cys, cscores = extract_peaks(coarse, threshold * self.coarse_ratio, sw, sh)
+            if len(cscores) > self.max_candidates:
+                top = np.argpartition(-cscores, self.max_candidates)[: self.max_candidates]
+                cxs, cys = cxs[top], cys[top]
+
+            # **[2] 원본 해상도에서 후보 주변만 정밀 매칭**
+            xs, ys, scores = self._refine(gray_frame, template, cxs * factor, cys * factor, factor, threshold)
+            matches.append((scale, w, h, xs, ys, scores))
+
+        return merge_scale_matches(matches, iou_threshold)
+
+    def _refine(self, gray_frame, template, xs, ys, factor, threshold):
+        frame_h, frame_w = gray_frame.shape[:2]
+        h, w = template.shape
+        margin = factor + 1  # 축소 좌표 반올림 오차 보정
+
+        found_x, found_y, found_score = [], [], []
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            x1 = max(0, x - margin)
+            y1 = max(0, y - margin)
+            x2 = min(frame_w, x + w + margin)
+            y2 = min(frame_h, y + h + margin)
+            if x2 - x1 < w or y2 - y1 < h:
+                continue
+
+            result = cv2.matchTemplate(gray_frame[y1:y2, x1:x2], template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val >= threshold:
+                found_x.append(x1 + max_loc[0])
+                found_y.append(y1 + max_loc[1])
+                found_score.append(max_val)
+
+        return (
+            np.asarray(found_x, dtype=np.intp),
+            np.asarray(found_y, dtype=np.intp),
+            np.asarray(found_score, dtype=np.float32),
+        )
+
+    @staticmethod
+    def _downsample(image, factor):
+        return cv2.resize(image, None, fx=1.0 / factor, fy=1.0 / factor, interpolation=cv2.INTER_AREA)
+
+    def _small_templates(self, resized_templates, factor):
+        """축소 템플릿. TemplateSet 이면 레지스트리에서 원본 기준으로 만들어 캐시한다."""
+        template_path = getattr(resized_templates, "template_path", None)
+        if template_path is not None:
+            small = self.registry.get(
+                template_path,
+                [scale / factor for scale in resized_templates.scales],
+                resized_templates.interpolation,
+            )
+            if small is not None:
+                return small
+        return [self._downsample(template, factor) for template in resized_templates]
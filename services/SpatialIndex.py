@@ -0,0 +1,217 @@
+"""
+탐지 좌표 공간 색인 (격자 버킷)과 제외 영역 (본인 아이콘, HUD, 미니맵).
+"""
+from collections import defaultdict
+
+import numpy as np
+
+
+class GridIndex:
+    """
+    키별 좌표를 격자 버킷에 저장하는 공간 색인.
+    사용 예:
+        index = GridIndex(cell_size=16)
+        index.insert(target_id, x, y)
+        index.query_radius(x, y, 12)    # [(key, x, y), ...]
+        index.nearest(x, y, max_radius=12)
+    """
+
+    def __init__(self, cell_size=16):
+        """
+        Args:
+            cell_size (float): 버킷 한 변 길이 (px). 주로 쓰는 질의 반경과 비슷하게 잡는다.
+        """
+        self.cell_size = float(cell_size)
+        self._cells = defaultdict(dict)  # (cell_x, cell_y) -> {key: (x, y)}
+        self._items = {}  # key -> (x, y, cell)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, key, x, y):
+        """좌표를 추가합니다. 이미 있는 키면 위치를 옮깁니다."""
+        if key in self._items:
+            self.remove(key)
+        cell = self._cell(x, y)
+        self._cells[cell][key] = (x, y)
+        self._items[key] = (x, y, cell)
+
+    move = insert
+
+    def remove(self, key):
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        cell = item[2]
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._items.clear()
+
+    def get(self, key):
+        item = self._items.get(key)
+        return None if item is None else item[:2]
+
+    def _cells_in_box(self, x1, y1, x2, y2):
+        cx1, cy1 = self._cell(x1, y1)
+        cx2, cy2 = self._cell(x2, y2)
+        for cell_x in range(cx1, cx2 + 1):
+            for cell_y in range(cy1, cy2 + 1):
+                bucket = self._cells.get((cell_x, cell_y))
+                if bucket:
+                    yield bucket
+
+    def query_radius(self, x, y, radius):
+        """
+        (x, y) 에서 radius 이내(유클리드)인 항목을 반환합니다.
+        Returns:
+            list: [(key, x, y), ...] (순서 없음)
+        """
+        limit = radius * radius
+        found = []
+        for bucket in self._cells_in_box(x - radius, y - radius, x + radius, y + radius):
+            for key, (px, py) in bucket.items():
+                if (px - x) ** 2 + (py - y) ** 2 <= limit:
+                    found.append((key, px, py))
+        return found
+
+    def _ring(self, center_x, center_y, ring):
+        """Chebyshev 거리가 ring 인 테두리 버킷 (비어 있지 않은 것만)"""
+        if ring == 0:
+            cells = [(center_x, center_y)]
+        else:
+            top, bottom = center_y - ring, center_y + ring
+            left, right = center_x - ring, center_x + ring
+            cells = [(cell_x, top) for cell_x in range(left, right + 1)]
+            cells += [(cell_x, bottom) for cell_x in range(left, right + 1)]
+            cells += [(left, cell_y) for cell_y in range(top + 1, bottom)]
+            cells += [(right, cell_y) for cell_y in range(top + 1, bottom)]
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket:
+                yield bucket
+
+    def nearest(self, x, y, max_radius=None):
+        """
+        가장 가까운 항목을 찾습니다. 주변 버킷부터 테두리 한 겹씩 넓혀 가며 찾고, 더 먼 겹에 더 가까운 점이
+        있을 수 없으면 멈춥니다. 지금까지 본 칸 수가 비어 있지 않은 버킷 수보다 많아지면 (점이 멀리 흩어진 경우)
+        남은 겹 대신 버킷을 직접 훑는다.
+        Args:
+            max_radius (float): 이 거리보다 먼 항목은 무시. None 이면 제한 없음.
+        Returns:
+            tuple: (key, x, y, distance), 없으면 None.
+        """
+        if not self._items:
+            return None
+        center_x, center_y = self._cell(x, y)
+        max_ring = int(max_radius // self.cell_size) + 1 if max_radius is not None else None
+        best, best_distance = None, float("inf") if max_radius is None else float(max_radius)
+
+        def scan(buckets):
+            nonlocal best, best_distance
+            for bucket in buckets:
+                for key, (px, py) in bucket.items():
+                    distance = ((px - x) ** 2 + (py - y) ** 2) ** 0.5
+                    if distance <= best_distance:
+                        best, best_distance = (key, px, py), distance
+
+        ring = 0
+        while max_ring is None or ring <= max_ring:
+            # ring 겹 버킷 안의 점은 최소 (ring - 1) * cell_size 만큼 떨어져 있다
+            if best is not None and (ring - 1) * self.cell_size > best_distance:
+                break
+            if (2 * ring + 1) ** 2 > len(self._cells):
+                scan(list(self._cells.values()))
+                break
+            scan(self._ring(center_x, center_y, ring))
+            ring += 1
+        if best is None:
+            return None
+        return best + (best_distance,)
+
+
+class ExclusionZones:
+    """
+    이름 붙은 제외 영역 모음 (창 내부 또는 호출자 좌표계).
+    사용 예:
+        zones = ExclusionZones()
+        zones.add_circle("player", cx, cy, 20)
+        zones.add_rect("minimap", 1600, 0, 1920, 300)
+        keep = ~zones.mask(xs, ys)
+    """
+
+    def __init__(self):
+        self._rects = {}  # name -> (x1, y1, x2, y2)
+        self._circles = {}  # name -> (cx, cy, r)
+
+    def __len__(self):
+        return len(self._rects) + len(self._circles)
+
+    def add_rect(self, name, x1, y1, x2, y2):
+        """사각형 제외 영역 (x1 <= x < x2, y1 <= y < y2). 같은 이름이면 교체."""
+        self._circles.pop(name, None)
+        self._rects[name] = (x1, y1, x2, y2)
+
+    def add_circle(self, name, cx, cy, radius):
+        """원형 제외 영역 (중심에서 radius 이내). 같은 이름이면 교체."""
+        self._rects.pop(name, None)
+        self._circles[name] = (cx, cy, radius)
+
+    def remove(self, name):
+        self._rects.pop(name, None)
+        self._circles.pop(name, None)
+
+    def clear(self):
+        self._rects.clear()
+        self._circles.clear()
+
+    def zone_at(self, x, y):
+        """(x, y) 를 포함하는 첫 제외 영역 이름, 없으면 None."""
+        for name, (x1, y1, x2, y2) in self._rects.items():
+            if x1 <= x < x2 and y1 <= y < y2:
+                return name
+        for name, (cx, cy, radius) in self._circles.items():
+            if (x - cx) ** 2 + (y - cy) ** 2 <= radius * radius:
+                return name
+        return None
+
+    def contains(self, x, y):
+        return self.zone_at(x, y) is not None
+
+    def mask(self, xs, ys):
+        """
+        좌표 배열 중 제외 영역에 들어가는 항목을 표시합니다 (영역 수만큼의 벡터 연산).
+        Returns:
+            numpy.ndarray: bool 배열 (True = 제외).
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        excluded = np.zeros(xs.shape, dtype=bool)
+        for x1, y1, x2, y2 in self._rects.values():
+            excluded |= (xs >= x1) & (xs < x2) & (ys >= y1) & (ys < y2)
+        for cx, cy, radius in self._circles.values():
+            excluded |= (xs - cx) ** 2 + (ys - cy) ** 2 <= radius * radius
+        return excluded
+
+    def filter(self, points):
+        """
+        제외 영역 밖의 항목만 남깁니다.
+        Args:
+            points (list): Detection 또는 (x, y, ...) 리스트.
+        """
+        if not points or not len(self):
+            return list(points)
+        xs = np.fromiter((p[0] for p in points), dtype=np.float64, count=len(points))
+        ys = np.fromiter((p[1] for p in points), dtype=np.float64, count=len(points))
+        keep = ~self.mask(xs, ys)
+        return [p for p, k in zip(points, keep) if k]
@@ -0,0 +1,188 @@
+"""
+탐지 대상 우선순위 큐 - 여러 프레임의 탐지를 대상 단위로 합치고 tick 마다 가장 좋은 대상 하나를 내보낸다.
+"""
+import itertools
+import time
+
+import numpy as np
+
+from services.SpatialIndex import ExclusionZones, GridIndex
+
+
+class Target:
+    """여러 프레임에 걸쳐 합쳐진 탐지 대상 하나"""
+
+    def __init__(self, target_id, x, y, score, now):
+        self.id = target_id
+        self.x = x
+        self.y = y
+        self.score = score
+        self.first_seen = now
+        self.last_seen = now
+        self.hits = 1
+        self.acted_at = None  # 마지막으로 행동(드래그/클릭)을 내보낸 시각
+
+    def __repr__(self):
+        return f"Target(id={self.id}, x={self.x}, y={self.y}, score={self.score:.2f}, hits={self.hits})"
+
+
+class TargetQueue:
+    """
+    사용 예:
+        queue = TargetQueue(merge_radius=12, max_age=1.0)
+        queue.update(positions_or_detections, center=(cx, cy))   # 프레임마다
+        target = queue.next_action()                              # tick 마다 최대 하나
+        if target is not None:
+            dispatcher.drag(hwnd, center, (target.x, target.y))
+
+        queue.zones.add_rect("minimap", 1600, 0, 1920, 300)       # 추가 제외 영역
+    """
+
+    def __init__(self, merge_radius=12, max_age=1.0, exclusion_radius=5, action_cooldown=1.0,
+                 distance_weight=1.0, score_weight=1.0, age_weight=0.5, smoothing=0.5, min_interval=0.0, zones=None):
+        """
+        Args:
+            merge_radius (float): 이 거리 (px, 유클리드) 안의 탐지는 같은 대상으로 합친다.
+            max_age (float): 마지막 탐지 후 이 시간(초)이 지나면 대상을 만료.
+            exclusion_radius (float): 화면 중심에서 이 거리 이하인 탐지는 버린다 (본인 아이콘, zones 의 "player" 원).
+            action_cooldown (float): 같은 대상에 다시 행동하기까지 최소 시간 (초).
+            distance_weight, score_weight, age_weight (float): 순위 비용 가중치
+                비용 = 거리 / 화면 대각선 x distance_weight + (1 - 점수) x score_weight + 경과 시간 / max_age x age_weight
+            smoothing (float): 다시 탐지된 좌표를 반영하는 비율 (1 이면 최신 좌표로 교체).
+            min_interval (float): 행동 사이 최소 간격 (초). tick 주기가 일정하지 않은 호출자용.
+            zones (ExclusionZones): HUD / 미니맵 등 추가 제외 영역 (detections 와 같은 좌표계).
+        """
+        self.merge_radius = merge_radius
+        self.max_age = max_age
+        self.exclusion_radius = exclusion_radius
+        self.action_cooldown = action_cooldown
+        self.distance_weight = distance_weight
+        self.score_weight = score_weight
+        self.age_weight = age_weight
+        self.smoothing = smoothing
+        self.min_interval = min_interval
+        self.last_action = None
+
+        self.center = (0, 0)
+        self.diagonal = 1.0
+        self.targets = {}  # id -> Target
+        self.index = GridIndex(cell_size=max(1.0, merge_radius))  # id -> 대상 좌표
+        self.zones = zones if zones is not None else ExclusionZones()
+        self._ids = itertools.count(1)
+        self.merged = 0
+        self.expired = 0
+
+    def __len__(self):
+        return len(self.targets)
+
+    @staticmethod
+    def _unpack(detection):
+        """Detection (x, y, score, ...) 또는 (x, y) 좌표를 (x, y, score) 로"""
+        if hasattr(detection, "score"):
+            return detection.x, detection.y, float(detection.score)
+        x, y = detection[0], detection[1]
+        return x, y, float(detection[2]) if len(detection) > 2 else 1.0
+
+    def update(self, detections, center=None, size=None, now=None):
+        """
+        한 프레임의 탐지 결과를 반영합니다.
+        Args:
+            detections (list): Detection 또는 (x, y[, score]) 리스트. center 와 같은 좌표계.
+            center (tuple): 화면(창) 중심 좌표. 지정하면 갱신.
+            size (tuple): 화면 (width, height). 지정하면 거리 정규화 기준(대각선) 갱신.
+            now (float): 현재 시각 (time.monotonic). 테스트용.
+        """
+        now = time.monotonic() if now is None else now
+        if center is not None:
+            self.center = center
+            if self.exclusion_radius > 0:
+                self.zones.add_circle("player", center[0], center[1], self.exclusion_radius)
+        if size is not None:
+            self.diagonal = max(1.0, float(np.hypot(*size)))
+
+        points = self.zones.filter([self._unpack(d) for d in detections])
+        # 점수 높은 탐지부터 합쳐서 같은 대상 근처의 약한 중복 좌표가 위치를 흔들지 않게 한다
+        points.sort(key=lambda p: -p[2])
+        for x, y, score in points:
+            target = self._nearest(x, y)
+            if target is None:
+                target = Target(next(self._ids), x, y, score, now)
+                self.targets[target.id] = target
+                self.index.insert(target.id, x, y)
+            else:
+                if target.last_seen != now:
+                    target.x += (x - target.x) * self.smoothing
+                    target.y += (y - target.y) * self.smoothing
+                    target.hits += 1
+                    self.index.move(target.id, target.x, target.y)
+                    # 이전 프레임 점수는 프레임당 한 번만 감쇠
+                    target.score = max(target.score * 0.9, score)
+                else:
+                    target.score = max(target.score, score)
+                self.merged += 1
+            target.last_seen = now
+
+        self.expire(now)
+
+    def _nearest(self, x, y):
+        """merge_radius 안에서 가장 가까운 대상 (이번 프레임에 이미 합친 대상도 포함)"""
+        found = self.index.nearest(x, y, max_radius=self.merge_radius)
+        return None if found is None else self.targets[found[0]]
+
+    def expire(self, now=None):
+        """max_age 동안 다시 탐지되지 않은 대상을 제거합니다."""
+        now = time.monotonic() if now is None else now
+        stale = [target_id for target_id, t in self.targets.items() if now - t.last_seen > self.max_age]
+        for target_id in stale:
+            del self.targets[target_id]
+            self.index.remove(target_id)
+        self.expired += len(stale)
+
+    def _center_distance(self, target):
+        # 기존 루프와 같은 맨해튼 거리
+        return abs(self.center[0] - target.x) + abs(self.center[1] - target.y)
+
+    def cost(self, target, now):
+        """순위 비용 (작을수록 먼저 행동)"""
+        return (
+            self._center_distance(target) / self.diagonal * self.distance_weight
+            + (1.0 - target.score) * self.score_weight
+            + (now - target.last_seen) / self.max_age * self.age_weight
+        )
+
+    def ranked(self, now=None):
+        """
+        행동 가능한 대상을 비용 오름차순으로 반환합니다 (제외 영역 안 / 재행동 대기 중인 대상 제외).
+        """
+        now = time.monotonic() if now is None else now
+        candidates = [
+            t for t in self.targets.values()
+            if not self.zones.contains(t.x, t.y)
+            and (t.acted_at is None or now - t.acted_at >= self.action_cooldown)
+        ]
+        return sorted(candidates, key=lambda t: self.cost(t, now))
+
+    def next_action(self, now=None):
+        """
+        이번 tick 에 행동할 대상 하나를 꺼냅니다. 없으면 None.
+        Returns:
+            Target: 가장 비용이 작은 대상 (행동 시각이 기록되어 action_cooldown 동안 다시 나오지 않음).
+        """
+        now = time.monotonic() if now is None else now
+        if self.last_action is not None and now - self.last_action < self.min_interval:
+            return None
+        self.expire(now)
+        ranked = self.ranked(now)
+        if not ranked:
+            return None
+        target = ranked[0]
+        target.acted_at = now
+        self.last_action = now
+        return target
+
+    def clear(self):
+        self.targets = {}
+        self.index.clear()
+
+    def stats(self):
+        return {"targets": len(self.targets), "merged": self.merged, "expired": self.expired}
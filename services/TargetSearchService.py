@@ -0,0 +1,111 @@
+import threading
+import cv2
+import numpy as np
+import win32gui
+import win32ui
+import win32con
+import pyautogui
+
+from services.FeatureMatchService import FeatureMatcher
+
+# 템플릿 특징점 / FLANN 인덱스는 matcher 에 캐시되므로 호출마다 새로 만들지 않는다.
+# FLANN matcher 는 스레드 간 공유하면 안 되므로 스레드마다 따로 보관한다.
+_local = threading.local()
+
+def get_feature_matcher(detector="sift"):
+    """현재 스레드의 검출기별 FeatureMatcher (sift / orb / akaze)"""
+    matchers = getattr(_local, "matchers", None)
+    if matchers is None:
+        matchers = _local.matchers = {}
+    matcher = matchers.get(detector)
+    if matcher is None:
+        matcher = FeatureMatcher(detector)
+        matchers[detector] = matcher
+    return matcher
+
+def capture_window(hwnd):
+    """특정 창의 화면을 캡처"""
+    rect = win32gui.GetWindowRect(hwnd)
+    width = rect[2] - rect[0]
+    height = rect[3] - rect[1]
+
+    hwndDC = win32gui.GetWindowDC(hwnd)
+    mfcDC = win32ui.CreateDCFromHandle(hwndDC)
+    saveDC = mfcDC.CreateCompatibleDC()
+    saveBitmap = win32ui.CreateBitmap()
+    saveBitmap.CreateCompatibleBitmap(mfcDC, width, height)
+    saveDC.SelectObject(saveBitmap)
+    saveDC.BitBlt((0, 0), (width, height), mfcDC, (0, 0), win32con.SRCCOPY)
+
+    bmpinfo = saveBitmap.GetInfo()
+    bmpstr = saveBitmap.GetBitmapBits(True)
+
+    img = np.frombuffer(bmpstr, dtype="uint8")
+    img.shape = (height, width, 4)
+
+    win32gui.DeleteObject(saveBitmap.GetHandle())
+    saveDC.DeleteDC()
+    mfcDC.DeleteDC()
+    win32gui.ReleaseDC(hwnd, hwndDC)
+
+    return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+
+def match_icon_in_window(hwnd, template_path, detector="sift", debug=False):
+    """
+    특정 창에서 템플릿 이미지를 검색
+    Args:
+        detector (str): 특징점 검출기 (sift / orb / akaze)
+        debug (bool): True 면 매칭 결과를 창으로 표시하고 키 입력을 기다림 (탐지 루프에서는 사용 금지)
+    """
+    # 창 캡처
+    captured_image = capture_window(hwnd)
+
+    found = match_icon_in_image(captured_image, template_path, detector)
+    if found is None:
+        return None
+    (center_x, center_y), dst = found
+
+    if debug:
+        # 디버그용: 매칭 결과 표시
+        captured_with_matches = cv2.polylines(
+            captured_image, [np.int32(dst)], isClosed=True, color=(0, 255, 0), thickness=3
+        )
+        cv2.imshow("Matched Icon", captured_with_matches)
+        cv2.waitKey(0)
+        cv2.destroyAllWindows()
+
+    return (center_x, center_y)
+
+def match_icon_in_image(captured_image, template_path, detector="sift"):
+    """
+    캡처된 화면에서 템플릿 이미지를 특징점 매칭으로 검색 (화면 출력 없음)
+    템플릿 특징점은 파일 해시 기준으로 디스크에 캐시되고, FLANN + ratio test 로 매칭한다.
+    Returns:
+        tuple: ((center_x, center_y), 템플릿 외곽 좌표), 찾지 못하면 None
+    """
+    return get_feature_matcher(detector).match(captured_image, template_path)
+
+if __name__ == "__main__":
+    # 프로젝트 루트에서 python -m services.TargetSearchService 로 실행
+    # 대상 창 제목
+    window_title = "Diablo II: Resurrected"  # 실제 게임 창 제목을 입력
+    hwnd = win32gui.FindWindow(None, window_title)
+
+    if hwnd == 0:
+        print(f"'{window_title}' 창을 찾을 수 없습니다.")
+        exit()
+
+    # 템플릿 이미지 경로
+    template_path = "template.png"
+
+    # 템플릿 매칭 수행
+    try:
+        icon_position = match_icon_in_window(hwnd, template_path, debug=True)
+        if icon_position:
+            print(f"아이콘 위치: {icon_position}")
+            # pyautogui를 사용해 마우스를 이동
+            pyautogui.moveTo(icon_position[0], icon_position[1])
+        else:
+            print("아이콘을 찾을 수 없습니다.")
+    except Exception as e:
+        print(f"오류: {e}")
@@ -0,0 +1,146 @@
+"""
+템플릿 레지스트리 - 템플릿 원본과 크기 변형본을 메모리에 캐시한다.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+
+from services.LogService import LogHandler
+
+
+class TemplateSet:
+    """한 템플릿의 크기 변형본 묶음 (Grayscale, 읽기 전용)"""
+
+    def __init__(self, template_path, mtime, scales, interpolation, templates):
+        self.template_path = template_path
+        self.mtime = mtime
+        self.scales = scales
+        self.interpolation = interpolation
+        self.templates = templates
+
+    def __iter__(self):
+        return iter(self.templates)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def __getitem__(self, index):
+        return self.templates[index]
+
+    def subset(self, indices):
+        """지정한 스케일 인덱스만 담은 TemplateSet 을 반환합니다 (배열은 복사하지 않음)."""
+        return TemplateSet(
+            self.template_path,
+            self.mtime,
+            tuple(self.scales[i] for i in indices),
+            self.interpolation,
+            [self.templates[i] for i in indices],
+        )
+
+
+class TemplateRegistry:
+    """
+    템플릿을 한 번만 로드하고 크기 변형본을 LRU 로 캐시한다.
+    키: (경로, 수정시각, 스케일 목록, 보간법)
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, max_entries=32):
+        """
+        Args:
+            max_entries (int): 보관할 최대 변형본 묶음 수. 초과 시 가장 오래 안 쓴 항목부터 제거.
+        """
+        self.max_entries = max_entries
+        self._variants = OrderedDict()  # (path, mtime, scales, interpolation) -> TemplateSet
+        self._sources = OrderedDict()  # (path, mtime) -> 원본 Grayscale 이미지
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, template_path, scales, interpolation=cv2.INTER_AREA):
+        """
+        크기 변형된 템플릿 묶음을 반환합니다.
+        Args:
+            template_path (str): 템플릿 이미지 경로.
+            scales (list): 템플릿 크기 조정 비율 리스트.
+            interpolation (int): cv2.resize 보간법.
+        Returns:
+            TemplateSet: 템플릿 묶음, 로드 실패 시 None.
+        """
+        try:
+            mtime = os.stat(template_path).st_mtime_ns
+        except OSError:
+            self.logger.error("템플릿 파일에 접근할 수 없습니다.", template_path)
+            return None
+
+        key = (template_path, mtime, tuple(scales), interpolation)
+        with self._lock:
+            template_set = self._variants.get(key)
+            if template_set is not None:
+                self._variants.move_to_end(key)
+                self.hits += 1
+                return template_set
+            self.misses += 1
+
+        source = self._load_source(template_path, mtime)
+        if source is None:
+            return None
+
+        templates = []
+        for scale in scales:
+            resized = cv2.resize(source, None, fx=scale, fy=scale, interpolation=interpolation)
+            resized.flags.writeable = False
+            templates.append(resized)
+        template_set = TemplateSet(template_path, mtime, key[2], interpolation, templates)
+
+        with self._lock:
+            self._variants[key] = template_set
+            self._variants.move_to_end(key)
+            self._evict(self._variants)
+        return template_set
+
+    def _load_source(self, template_path, mtime):
+        """원본 템플릿을 (경로, 수정시각) 기준으로 한 번만 읽는다."""
+        key = (template_path, mtime)
+        with self._lock:
+            source = self._sources.get(key)
+            if source is not None:
+                self._sources.move_to_end(key)
+                return source
+
+        source = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+        if source is None:
+            self.logger.error("탐지할 템플릿 이미지를 로드할 수 없습니다.", template_path)
+            return None
+        source.flags.writeable = False
+
+        with self._lock:
+            self._sources[key] = source
+            self._evict(self._sources)
+        return source
+
+    def _evict(self, entries):
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """캐시 적중/실패 카운터를 반환합니다."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._variants),
+                "sources": len(self._sources),
+            }
+
+    def clear(self):
+        """캐시를 비운다 (카운터는 유지)."""
+        with self._lock:
+            self._variants.clear()
+            self._sources.clear()
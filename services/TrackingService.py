@@ -0,0 +1,160 @@
+"""
+ROI 추적 모드 - 이전 탐지 위치 주변만 매칭하고 놓치면 전체 화면 탐지로 돌아간다.
+"""
+import numpy as np
+
+from services.LogService import LogHandler
+from services.MatchFilter import CONTAINMENT_THRESHOLD, non_max_suppression
+
+
+class Track:
+    """추적 중인 대상 하나"""
+
+    def __init__(self, detection, scale_index):
+        self.detection = detection
+        self.scale_index = scale_index
+        self.missed = 0
+
+
+class IconTracker:
+    """
+    IconDetector 의 템플릿 매칭을 ROI 단위로 수행하는 추적기.
+    사용 예:
+        tracker = IconTracker(detector, full_scan_interval=30)
+        detections = tracker.detect(gray_frame, resized_templates, threshold)
+    """
+
+    logger = LogHandler("FIND")
+
+    def __init__(self, detector, padding=1.5, full_scan_interval=30, scale_window=1, max_missed=2, iou_threshold=0.3):
+        """
+        Args:
+            detector (IconDetector): 템플릿 매칭을 수행할 탐지기.
+            padding (float): ROI 여백 (템플릿 크기 대비 배수).
+            full_scan_interval (int): 전체 화면 탐지 주기 (프레임).
+            scale_window (int): 매칭된 스케일 앞뒤로 함께 검사할 스케일 수.
+            max_missed (int): 연속으로 놓쳐도 유지할 프레임 수. 초과 시 전체 화면 탐지.
+            iou_threshold (float): ROI 간 중복 제거(NMS) 겹침 기준.
+        """
+        self.detector = detector
+        self.padding = padding
+        self.full_scan_interval = full_scan_interval
+        self.scale_window = scale_window
+        self.max_missed = max_missed
+        self.iou_threshold = iou_threshold
+
+        self.tracks = []
+        self.frames_since_full_scan = 0
+        self.full_scans = 0
+        self.roi_scans = 0
+
+    def reset(self):
+        """추적 상태를 비워 다음 프레임에서 전체 화면 탐지를 하도록 합니다."""
+        self.tracks = []
+        self.frames_since_full_scan = 0
+
+    def detect(self, gray_frame, resized_templates, threshold=0.6):
+        """
+        추적 대상이 있으면 ROI 만, 없거나 주기가 되면 전체 화면을 탐지합니다.
+        Args:
+            gray_frame (numpy.ndarray): 녹색만 남긴 Grayscale 화면.
+            resized_templates (TemplateSet | list): 크기 조정된 템플릿 이미지 리스트.
+            threshold (float): 탐지 민감도.
+        Returns:
+            list: 점수 내림차순 Detection 리스트.
+        """
+        self.frames_since_full_scan += 1
+        if not self.tracks or self.frames_since_full_scan >= self.full_scan_interval:
+            return self._full_scan(gray_frame, resized_templates, threshold)
+
+        detections, lost = self._roi_scan(gray_frame, resized_templates, threshold)
+        if lost:
+            # 대상을 놓쳤다: 화면 밖으로 나갔거나 크게 움직였으므로 전체 화면 재탐지
+            self.logger.debug("추적 대상 손실, 전체 화면 탐지로 전환합니다.")
+            return self._full_scan(gray_frame, resized_templates, threshold)
+        return detections
+
+    def _full_scan(self, gray_frame, resized_templates, threshold):
+        detections = self.detector.match(gray_frame, resized_templates, threshold, self.iou_threshold)
+        self.tracks = [Track(detection, self._scale_index(resized_templates, detection)) for detection in detections]
+        self.frames_since_full_scan = 0
+        self.full_scans += 1
+        return detections
+
+    def _roi_scan(self, gray_frame, resized_templates, threshold):
+        frame_h, frame_w = gray_frame.shape[:2]
+        candidates = []
+        lost = False
+
+        for track in self.tracks:
+            detection = track.detection
+            pad_x = int(detection.width * (0.5 + self.padding))
+            pad_y = int(detection.height * (0.5 + self.padding))
+            x1 = max(0, detection.x - pad_x)
+            y1 = max(0, detection.y - pad_y)
+            x2 = min(frame_w, detection.x + pad_x)
+            y2 = min(frame_h, detection.y + pad_y)
+
+            templates = self._narrow_scales(resized_templates, track.scale_index)
+            roi = gray_frame[y1:y2, x1:x2]  # 복사 없는 view
+            found = self.detector._match_templates(roi, templates, threshold, self.iou_threshold)
+            self.roi_scans += 1
+
+            if found:
+                best = found[0]
+                track.detection = best._replace(x=best.x + x1, y=best.y + y1)
+                track.scale_index = self._scale_index(resized_templates, track.detection)
+                track.missed = 0
+                candidates.append(track)
+            else:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    lost = True
+                else:
+                    candidates.append(track)
+
+        # 겹치는 ROI 에서 같은 대상을 두 번 잡은 경우 정리
+        self.tracks = self._dedupe(candidates)
+        detections = [track.detection for track in self.tracks if track.missed == 0]
+        return detections, lost
+
+    def _dedupe(self, tracks):
+        if len(tracks) < 2:
+            return tracks
+        boxes = np.array(
+            [
+                [
+                    t.detection.x - t.detection.width // 2,
+                    t.detection.y - t.detection.height // 2,
+                    t.detection.x + t.detection.width // 2,
+                    t.detection.y + t.detection.height // 2,
+                ]
+                for t in tracks
+            ]
+        )
+        scores = np.array([t.detection.score for t in tracks])
+        keep = non_max_suppression(boxes, scores, self.iou_threshold, CONTAINMENT_THRESHOLD)
+        return [tracks[i] for i in keep]
+
+    def _narrow_scales(self, resized_templates, scale_index):
+        """매칭된 스케일과 앞뒤 scale_window 개 스케일만 남깁니다."""
+        first = max(0, scale_index - self.scale_window)
+        last = min(len(resized_templates), scale_index + self.scale_window + 1)
+        indices = range(first, last)
+        if hasattr(resized_templates, "subset"):
+            return resized_templates.subset(indices)
+        return [resized_templates[i] for i in indices]
+
+    @staticmethod
+    def _scale_index(resized_templates, detection):
+        scales = getattr(resized_templates, "scales", None)
+        if scales is not None and detection.scale in scales:
+            return scales.index(detection.scale)
+        return int(detection.scale) if isinstance(detection.scale, (int, np.integer)) else 0
+
+    def stats(self):
+        return {
+            "tracks": len(self.tracks),
+            "full_scans": self.full_scans,
+            "roi_scans": self.roi_scans,
+        }
@@ -0,0 +1,271 @@
+"""
+창 목록 캐시 - pid → 프로세스 이름을 캐시하고 WinEvent hook 또는 주기적으로 창 목록을 갱신한다.
+"""
+import threading
+import time
+
+from services.LogService import LogHandler
+
+
+# WinEvent 상수 (winuser.h)
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+
+
+class Win32WindowPlatform:
+    """win32gui / psutil 로 창과 프로세스 정보를 읽는다 (운영 환경)."""
+
+    def __init__(self):
+        import psutil
+        import win32gui
+        import win32process
+
+        self._psutil = psutil
+        self._win32gui = win32gui
+        self._win32process = win32process
+        self._hooks = {}  # hook 핸들 -> ctypes 콜백 (GC 되지 않도록 보관)
+
+    def visible_windows(self):
+        """보이는 최상위 창 목록 [(hwnd, pid, title), ...]"""
+        windows = []
+
+        def enum_windows_callback(hwnd, _):
+            if self._win32gui.IsWindowVisible(hwnd):
+                _, pid = self._win32process.GetWindowThreadProcessId(hwnd)
+                windows.append((hwnd, pid, self._win32gui.GetWindowText(hwnd)))
+
+        self._win32gui.EnumWindows(enum_windows_callback, None)
+        return windows
+
+    def pids(self):
+        """살아 있는 프로세스 pid 집합"""
+        return set(self._psutil.pids())
+
+    def process_name(self, pid):
+        """프로세스 이름. 종료되었거나 접근할 수 없으면 None."""
+        try:
+            return self._psutil.Process(pid).name()
+        except (self._psutil.NoSuchProcess, self._psutil.AccessDenied):
+            return None
+
+    def install_hook(self, callback):
+        """
+        창 생성 / 파괴 / 표시 / 숨김 / 제목 변경 때 callback() 을 호출하는 WinEvent hook 을 설치합니다.
+        hook 을 설치한 스레드에 메시지 루프가 있어야 이벤트가 전달된다 (Qt UI 스레드).
+        Returns:
+            int: hook 핸들 (remove_hook 용).
+        """
+        import ctypes
+        from ctypes import wintypes
+
+        procedure_type = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG, wintypes.LONG,
+            wintypes.DWORD, wintypes.DWORD
+        )
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+            if id_object == OBJID_WINDOW and id_child == 0:  # 창 자체의 이벤트만 (하위 컨트롤 제외)
+                callback()
+
+        procedure = procedure_type(on_event)
+        user32 = ctypes.windll.user32
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        handles = [
+            user32.SetWinEventHook(first, last, 0, procedure, 0, 0, WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS)
+            for first, last in ((EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE),
+                                (EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE))
+        ]
+        if not all(handles):
+            for handle in filter(None, handles):
+                user32.UnhookWinEvent(handle)
+            raise OSError("SetWinEventHook 호출에 실패했습니다.")
+        self._hooks[tuple(handles)] = procedure
+        return tuple(handles)
+
+    def remove_hook(self, handle):
+        import ctypes
+
+        for single in handle:
+            ctypes.windll.user32.UnhookWinEvent(single)
+        self._hooks.pop(handle, None)
+
+
+class StaticWindowPlatform:
+    """
+    메모리에 있는 창 / 프로세스 목록을 돌려준다 (Linux 테스트 / 재현용).
+    사용 예:
+        platform = StaticWindowPlatform(windows=[(1001, 42, "Diablo II: Resurrected")], processes={42: "D2R.exe"})
+        registry = WindowRegistry(platform)
+        platform.processes[43] = "D2R.exe"; platform.windows.append((1002, 43, "Diablo II: Resurrected"))
+        registry.invalidate()
+    """
+
+    def __init__(self, windows=None, processes=None):
+        self.windows = list(windows or [])  # [(hwnd, pid, title), ...]
+        self.processes = dict(processes or {})  # pid -> 프로세스 이름
+        self.name_lookups = 0
+        self._callbacks = {}
+        self._next_hook = 1
+
+    def visible_windows(self):
+        return list(self.windows)
+
+    def pids(self):
+        return set(self.processes)
+
+    def process_name(self, pid):
+        self.name_lookups += 1
+        return self.processes.get(pid)
+
+    def install_hook(self, callback):
+        handle = self._next_hook
+        self._next_hook += 1
+        self._callbacks[handle] = callback
+        return handle
+
+    def remove_hook(self, handle):
+        self._callbacks.pop(handle, None)
+
+    def notify(self):
+        """WinEvent 가 온 것처럼 설치된 hook 콜백을 호출합니다."""
+        for callback in list(self._callbacks.values()):
+            callback()
+
+
+class WindowRegistry:
+    """
+    사용 예:
+        registry = WindowRegistry()                   # 기본 platform: Win32WindowPlatform
+        registry.install_hook()                       # 선택: UI 스레드에서 호출하면 이벤트 기반 갱신
+        registry.find("D2R.exe")                      # [(hwnd, title), ...]
+    """
+
+    logger = LogHandler("WindowsService")
+
+    def __init__(self, platform=None, max_age=2.0):
+        """
+        Args:
+            platform: visible_windows / pids / process_name (/ install_hook / remove_hook) 를 가진 객체.
+                      없으면 Win32WindowPlatform.
+            max_age (float): hook 이 없을 때 창 목록을 다시 읽기 전까지 재사용하는 시간 (초).
+        """
+        self.platform = platform if platform is not None else Win32WindowPlatform()
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._names = {}  # pid -> 프로세스 이름 (조회에 실패한 pid 는 캐시하지 않고 다음 갱신 때 다시 조회)
+        self._windows = []  # [(hwnd, pid, title), ...]
+        self._refreshed_at = None
+        self._dirty = True
+        self._hook = None
+
+        self.refreshes = 0
+        self.name_lookups = 0
+        self.cache_hits = 0
+
+    @property
+    def hooked(self):
+        return self._hook is not None
+
+    def install_hook(self):
+        """
+        창 변경 WinEvent hook 을 설치합니다. 실패하면 로그만 남기고 max_age 기반 갱신을 사용합니다.
+        Returns:
+            bool: 설치 여부.
+        """
+        if self._hook is not None:
+            return True
+        try:
+            self._hook = self.platform.install_hook(self.invalidate)
+        except Exception as e:
+            self.logger.warn("창 변경 hook 을 설치하지 못했습니다. 주기적 갱신을 사용합니다.", e)
+            self._hook = None
+        return self._hook is not None
+
+    def remove_hook(self):
+        if self._hook is not None:
+            self.platform.remove_hook(self._hook)
+            self._hook = None
+
+    def invalidate(self):
+        """다음 검색 때 창 목록을 다시 읽도록 표시합니다 (hook 콜백)."""
+        self._dirty = True
+
+    def _stale(self, now):
+        if self._dirty or self._refreshed_at is None:
+            return True
+        return self._hook is None and now - self._refreshed_at > self.max_age
+
+    def refresh(self):
+        """
+        창 목록을 다시 읽고 pid 캐시를 증분 갱신합니다.
+            - 더 이상 살아 있지 않은 pid 는 캐시에서 지운다 (pid 재사용 대비).
+            - 처음 보는 pid (또는 이전 조회에 실패한 pid) 만 프로세스 이름을 조회한다.
+        """
+        with self._lock:
+            self._dirty = False  # 읽는 도중 온 이벤트는 다음 검색에서 반영
+            windows = self.platform.visible_windows()
+            live = self.platform.pids()
+            for pid in self._names.keys() - live:
+                del self._names[pid]
+            for _, pid, _ in windows:
+                if pid not in self._names:
+                    name = self.platform.process_name(pid)
+                    self.name_lookups += 1
+                    if name is not None:
+                        self._names[pid] = name
+            self._windows = windows
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+
+    def windows(self, refresh=False):
+        """
+        보이는 창 목록을 반환합니다.
+        Args:
+            refresh (bool): True 면 캐시와 관계없이 다시 읽는다.
+        Returns:
+            list: [(hwnd, pid, title, process_name), ...]
+        """
+        if refresh or self._stale(time.monotonic()):
+            self.refresh()
+        else:
+            self.cache_hits += 1
+        with self._lock:
+            return [(hwnd, pid, title, self._names.get(pid)) for hwnd, pid, title in self._windows]
+
+    def find(self, process_name, refresh=False):
+        """
+        주어진 프로세스 이름의 보이는 창을 찾습니다.
+        Returns:
+            list: [(hwnd, title), ...] (EnumWindows 순서)
+        """
+        return [(hwnd, title) for hwnd, _, title, name in self.windows(refresh) if name == process_name]
+
+    def stats(self):
+        return {
+            "windows": len(self._windows),
+            "pids": len(self._names),
+            "refreshes": self.refreshes,
+            "name_lookups": self.name_lookups,
+            "cache_hits": self.cache_hits,
+            "hooked": self.hooked,
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_window_registry():
+    """프로세스 공용 WindowRegistry (Win32 platform, 처음 호출 시 생성)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = WindowRegistry()
+        return _registry
@@ -1,40 +1,30 @@
 import sys
-import time
 import ctypes
 import win32gui, win32con , win32api
-import win32process
-import psutil
-import pyautogui
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QListWidget, QMessageBox, QInputDialog
 )
 import win32gui
 import win32con
-import win32process
-import psutil
-from services.ImageSearch import  IconDetector
+from services.DetectionScheduler import DetectionScheduler
+from services.DetectionWorker import DetectionSchedulerSignals, DetectionWorker
 from services.LogService import  LogHandler
+from services.WindowRegistry import get_window_registry
 class WindowsService:
     """Windows 창 관리 서비스 클래스"""
     logger = LogHandler("WindowsService")
     @staticmethod
-    def find_windows_by_process_name(process_name):
-        """주어진 프로세스 이름과 연결된 윈도우 핸들 검색"""
-        windows = []
-
-        def enum_windows_callback(hwnd, _):
-            if win32gui.IsWindowVisible(hwnd):
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                try:
-                    process = psutil.Process(pid)
-                    if process.name() == process_name:
-                        windows.append((hwnd, win32gui.GetWindowText(hwnd)))
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-
-        win32gui.EnumWindows(enum_windows_callback, None)
-        return windows
+    def find_windows_by_process_name(process_name, refresh=False):
+        """
+        주어진 프로세스 이름과 연결된 윈도우 핸들 검색 (WindowRegistry 캐시 사용)
+        Args:
+            process_name (str): 실행 파일 이름 (예: D2R.exe).
+            refresh (bool): True 면 캐시와 관계없이 창 목록을 다시 읽는다.
+        Returns:
+            list: [(hwnd, title), ...]
+        """
+        return get_window_registry().find(process_name, refresh)
     # DPI Aware 설정
     def set_dpi_awareness():
             try:
@@ -174,9 +164,23 @@ class DiabloManagerApp(QWidget):
     logger = LogHandler("FIND")
     """PyQt5 UI를 사용한 디아블로 창 관리 애플리케이션"""
 
+    template_path = "C:\\Dev\\Test\\target.png"  # 녹색 십자(+) 템플릿 이미지 "c:\\games\\target.png"
+    detection_threshold = 0.5
+    detection_scales = [0.5, 0.7, 1.0, 1.3, 1.5, 1.7, 2.0]
+    detection_roles = ("Master", "Slave")  # 역할을 지정하면 스케줄러로 동시에 탐지하는 창
+
     def __init__(self):
         super().__init__()
         self.window_roles = {}  # 각 창의 역할을 저장 (hwnd: role)
+        self.detection_worker = None  # 실행 중인 탐지 작업 스레드 (창 정보 출력에서 시작한 단일 창 탐지)
+        # Master / Slave 창 동시 탐지 - 결과는 작업 스레드에서 signal 로 UI 스레드에 전달
+        self.scheduler = DetectionScheduler(workers=2)
+        self.scheduler_signals = DetectionSchedulerSignals(self)
+        self.scheduler_signals.detected.connect(self.on_window_detected)
+        self.scheduler_signals.failed.connect(self.on_window_failed)
+        self._close_pending = False  # 탐지 스레드 종료를 기다렸다가 창을 닫는 중
+        # 창 목록 캐시 - UI 스레드 메시지 루프로 창 변경 이벤트를 받아 필요할 때만 다시 읽는다
+        get_window_registry().install_hook()
         self.init_ui()
 
     def init_ui(self):
@@ -220,25 +224,36 @@ class DiabloManagerApp(QWidget):
         info_button.clicked.connect(self.print_window_info)
         button_layout.addWidget(info_button)
 
+        # 탐지 중지 버튼
+        self.stop_button = QPushButton("탐지 중지")
+        self.stop_button.clicked.connect(self.stop_detection)
+        self.stop_button.setEnabled(False)
+        button_layout.addWidget(self.stop_button)
+
         # 종료 버튼
         exit_button = QPushButton("종료")
         exit_button.clicked.connect(self.close)
 
 
         layout.addLayout(button_layout)
+
+        # 탐지 상태 표시
+        self.status_label = QLabel("탐지 대기 중")
+        layout.addWidget(self.status_label)
         self.setLayout(layout)
 
         button_layout.addWidget(exit_button)
         self.detect_windows_detail( True)
 
     def detect_windows(self):
-        self.detect_windows_detail(False)
+        # 탐지 버튼은 사용자가 직접 누른 것이므로 창 목록을 다시 읽는다 (프로세스 이름은 캐시 사용)
+        self.detect_windows_detail(False, refresh=True)
 
-    def detect_windows_detail(self, isInit):
+    def detect_windows_detail(self, isInit, refresh=False):
         """디아블로 2 창 탐지 (프로세스 이름 기반)"""
         self.window_list_widget.clear()
         process_name = "D2R.exe"  # 디아블로 2의 실행 파일 이름
-        windows = WindowsService.find_windows_by_process_name(process_name)
+        windows = WindowsService.find_windows_by_process_name(process_name, refresh)
 
         if not windows :
             QMessageBox.warning(self, "경고", "디아블로 2 창을 찾을 수 없습니다.")
@@ -265,11 +280,41 @@ class DiabloManagerApp(QWidget):
         try:
             message = WindowsService.set_role(hwnd, selected_role)
             self.window_roles[hwnd] = selected_role  # 역할 업데이트
-            self.detect_windows()  # 창 목록 갱신
+            self.schedule_detection(hwnd, selected_role)
+            self.detect_windows_detail(False)  # 창 목록 갱신 (창 변경이 없으면 캐시된 목록 사용)
             QMessageBox.information(self, f"{selected_role} 설정 완료", f"창 (HWND: {hwnd}) {message}")
         except ValueError as e:
             QMessageBox.warning(self, "오류", str(e))
 
+    def schedule_detection(self, hwnd, role):
+        """
+        역할이 있는 창은 스케줄러에 등록하고 (이미 등록된 창은 역할과 캡처 영역만 변경), 최소화한 창은 해제합니다.
+        """
+        if role not in self.detection_roles:
+            self.scheduler.unregister(hwnd)
+            return
+
+        info = WindowsService.get_adjusted_window_info(hwnd)  # 역할에 따라 창을 옮긴 뒤의 위치
+        if not self.scheduler.set_role(hwnd, role, info):
+            self.scheduler.register(
+                hwnd, info, self.template_path, role,
+                threshold=self.detection_threshold, scales=self.detection_scales
+            )
+        if not self.scheduler.running:
+            self.scheduler.start(self.scheduler_signals.emit_detected, on_failure=self.scheduler_signals.emit_failed)
+        self.stop_button.setEnabled(True)
+
+    def on_window_detected(self, hwnd, result):
+        """스케줄러 작업 스레드의 창별 탐지 결과 (UI 스레드에서 호출)"""
+        role = self.window_roles.get(hwnd, "None")
+        self.status_label.setText(
+            f"[{role}] HWND {hwnd}: 탐지된 아이콘 수 {len(result.detections)} "
+            f"(프레임 {result.frame_index}, {result.elapsed * 1000:.1f}ms)"
+        )
+
+    def on_window_failed(self, hwnd, message):
+        QMessageBox.warning(self, "오류", f"창 (HWND: {hwnd}) 탐지가 계속 실패해 중지했습니다.\n{message}")
+
     def print_window_info(self):
         """선택된 창의 정보를 출력"""
         selected_items = self.window_list_widget.selectedItems()
@@ -281,7 +326,7 @@ class DiabloManagerApp(QWidget):
         hwnd = int(selected_text.split("(HWND: ")[-1].split(")")[0])  # HWND 추출
 
         info = WindowsService.get_adjusted_window_info(hwnd)
-        template_path =  "C:\\Dev\\Test\\target.png" # 녹색 십자(+) 템플릿 이미지 "c:\\games\\target.png"  # 탐지할 아이콘 템플릿 이미지 경로
+        template_path = self.template_path
 
         self.logger.debug(f"창이 위치한 모니터: {info['monitor_index']}")
         self.logger.debug(f"창 좌표 (모니터 기준): X={info['x']}, Y={info['y']}")
@@ -289,29 +334,89 @@ class DiabloManagerApp(QWidget):
         #fi = FindImage()
         #fi.capture_screen_and_find_icon(info=info, threshold=0.9, scales=[0.6,0.8,1.0,1.2,1.4,1.6,1.8])
 
-        detector = IconDetector()
-
         # 화면 캡처 영역 정보
         screen_info = {
             "x": info['x'],  # 캡처 시작 X 좌표
             "y": info['y'],  # 캡처 시작 Y 좌표
             "width": info['width'],  # 캡처 영역 너비
             "height": info['height'],  # 캡처 영역 높이
+            "hwnd": hwnd,  # 이벤트 기록용 창 핸들
         }
 
 
         win32gui.SetForegroundWindow(hwnd)
         self.logger.info("FOREGROUND WINDOW",hwnd)
-        time.sleep(1)
-     # 특정 아이콘 탐지 실행
-        
-        try:
-            detector.capture_screen_and_find_icons(screen_info, template_path, threshold=0.5 , scales= [0.5, 0.7, 1.0, 1.3,1.5,1.7,2.0])
-        except Exception as e:
-            self.logger.error("아이콘 탐지 중 오류가 발생했습니다.",e)
+     # 특정 아이콘 탐지 실행 - 작업 스레드에서 실행 (창 전환 대기 1초 포함), 결과는 signal 로 수신
+
+        if self.detection_worker is not None:
+            self.detection_worker.cancel()
+        self.detection_worker = DetectionWorker(
+            screen_info, template_path, threshold=self.detection_threshold, scales=self.detection_scales,
+            start_delay=1.0, parent=self
+        )
+        self.detection_worker.detected.connect(self.on_icons_detected)
+        self.detection_worker.progress.connect(self.on_detection_progress)
+        self.detection_worker.failed.connect(self.on_detection_failed)
+        self.detection_worker.finished.connect(self.on_detection_finished)
+        self.detection_worker.start()
+        self.stop_button.setEnabled(True)
+        self.status_label.setText(f"탐지 시작 (HWND: {hwnd})")
+
         QMessageBox.information(
             self,
             "창 정보",
             f"HWND: {info['hwnd']}\nX: {info['x']}\nY: {info['y']}\nWidth: {info['width']}\nHeight: {info['height']}"
         )
+
+    def stop_detection(self):
+        """실행 중인 탐지를 취소 (UI 는 멈추지 않고 finished signal 로 정리)"""
+        if self.detection_worker is not None:
+            self.detection_worker.cancel()
+            self.status_label.setText("탐지 중지 요청")
+        # 스케줄러는 창 등록만 해제 (진행 중인 프레임은 작업 스레드에서 끝난다)
+        for hwnd in list(self.scheduler.pipelines):
+            self.scheduler.unregister(hwnd)
+        if self.detection_worker is None:
+            self.stop_button.setEnabled(False)
+
+    def on_icons_detected(self, result):
+        """작업 스레드의 탐지 결과 (UI 스레드에서 호출)"""
+        self.status_label.setText(
+            f"탐지된 아이콘 수: {len(result.detections)} (프레임 {result.frame_index}, {result.elapsed * 1000:.1f}ms)"
+        )
+
+    def on_detection_progress(self, processed, total):
+        if total:
+            self.setWindowTitle(f"Diablo 2 Master-Slave Manager - 탐지 {processed}/{total}")
+
+    def on_detection_failed(self, message):
+        QMessageBox.warning(self, "오류", f"아이콘 탐지 중 오류가 발생했습니다.\n{message}")
+
+    def on_detection_finished(self):
+        worker = self.sender()
+        if worker is self.detection_worker:
+            self.detection_worker = None
+            self.stop_button.setEnabled(bool(self.scheduler.pipelines))
+            self.status_label.setText("탐지 종료")
+        if worker is not None:
+            worker.deleteLater()
+
+    def closeEvent(self, event):
+        """창을 닫을 때 탐지 스레드 정리 (실행 중인 스레드가 모두 끝난 뒤에 닫는다)"""
+        running = [worker for worker in self.findChildren(DetectionWorker) if worker.isRunning()]
+        for worker in running:
+            worker.cancel()  # UI 스레드를 막지 않도록 기다리지 않는다 (finished 에서 다시 닫음)
+        if running and not self._close_pending:
+            # 실행 중인 QThread 가 창과 함께 파괴되지 않도록 finished 이후에 다시 닫는다
+            self._close_pending = True
+            for worker in running:
+                worker.finished.connect(self.close)
+            running = [worker for worker in running if worker.isRunning()]  # 연결 전에 끝난 스레드 제외
+        if running:
+            self.status_label.setText("탐지 스레드 종료 대기 중")
+            event.ignore()
+            return
+        self.scheduler.stop()  # 진행 중인 프레임 (창마다 최대 한 프레임) 이 끝나기를 기다린다
+        get_window_registry().remove_hook()
+        super().closeEvent(event)
 #self, info, template_path, threshold=0.6, scales=[0.6, 0.8, 1.0, 1.2]):
\ No newline at end of file
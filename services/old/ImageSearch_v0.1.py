@@ -13,6 +13,8 @@ import win32con, win32gui
 
 from main.SendEventTest import send_click_to_window
 from services.LogService import  LogHandler
+from services.InputDispatcher import get_dispatcher
+from services.TargetQueue import TargetQueue
 """
 구 클래스
 """
@@ -84,9 +86,12 @@ class FindImage:
         self.logger.debug(f"Center 좌표 : ({monitor_center_x} , {monitor_center_y})")
 
 
+        # 프레임마다 탐지 좌표를 대상 단위로 합치고, tick 마다 가장 좋은 대상 하나로만 드래그
+        target_queue = TargetQueue(exclusion_radius=exclusion_radius, max_age=3.0)
+        start_pos = (monitor_center_x , monitor_center_y)
+
         with mss.mss() as sct:
             while True:
-                detected_positions = set()
                 # 화면 캡처
                 frame = np.array(sct.grab(monitor))
                 gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
@@ -94,33 +99,16 @@ class FindImage:
                 # 아이콘 탐지
                 icon_centers = self.detect_icons(gray_frame, resized_templates, threshold)
                 self.logger.debug(f"size: {len(icon_centers)}")
-                for center_x, center_y in icon_centers:
-
-                    absolute_x = monitor["top"] + center_x # 바꿈
-                    absolute_y = monitor["left"] + center_y
-
-                    distance = abs( monitor_center_x-absolute_x) + abs( monitor_center_y -absolute_y)
-                    self.logger.debug(f"distance: {distance}, x: {absolute_x}, y : {absolute_y}")
-                    if distance <= exclusion_radius:
-                        self.logger.debug(f"센터 근처 아이콘 발견: 무시합니다. x:{absolute_x},  :{absolute_y}")
-                        continue
-                        # 중복 탐지 방지
-
-                    if (center_x, center_y) in detected_positions:
-                            self.logger.debug(f"중복 아이콘 탐지로 제외됨: ({center_x}, {center_y})")
-                            continue
-
-                    self.logger.debug(f"아이콘 발견: ({absolute_x}, {absolute_y})")
-                    detected_positions.add((center_x, center_y))
-
-                        # 절대 좌표 계산 및 드래그
 
-                   # pyautogui.dragTo(x=absolute_x, y=absolute_y, duration=5)
+                # 절대 좌표로 변환 후 대상 큐에 반영 (중복 좌표는 같은 대상으로 합쳐짐)
+                absolute_positions = [(monitor["top"] + x, monitor["left"] + y) for x, y in icon_centers]
+                target_queue.update(absolute_positions, center=start_pos, size=(monitor["width"], monitor["height"]))
 
-                    start_pos = (monitor_center_x , monitor_center_y)
-                    end_pos = (absolute_x,absolute_y)
+                target = target_queue.next_action()
+                if target is not None:
+                    self.logger.debug(f"아이콘 발견: {target}")
+                    end_pos = (int(target.x), int(target.y))
                     self. post_drag_event(hwnd=_hwnd,start_pos=start_pos, end_pos=end_pos, duration=0.5, minimum_drag_distance=10)
-
                 else:
                     self.logger.debug("탐지된 아이콘 없음.")
 
@@ -151,29 +139,11 @@ class FindImage:
                 self.logger.debug(f"드래그 거리가 너무 짧아 무시됩니다. 거리: {distance}")
                 return
 
-            # 좌표를 LPARAM 형식으로 변환
-            lparam_start = win32api.MAKELONG(start_x, start_y)
-            lparam_end = win32api.MAKELONG(int(end_x), int(end_y))
-
-            # 드래그 시작: 마우스 왼쪽 버튼 눌림
-            win32gui.PostMessage(hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, lparam_start)
-            self.logger.debug(f"드래그 시작 좌표: {start_pos}")
-
-            # 이동: 점진적으로 마우스 이동
-            steps = 100  # 이동 단계 수 (더 많을수록 부드러움)
-            step_delay = duration / steps  # 각 단계 간 딜레이
-
-            for i in range(steps):
-                # 각 단계에서의 좌표 계산
-                intermediate_x = int(start_x + (end_x - start_x) * (i / steps))
-                intermediate_y = int(start_y + (end_y - start_y) * (i / steps))
-                lparam_intermediate = win32api.MAKELONG(intermediate_x, intermediate_y)
-                win32gui.PostMessage(hwnd, win32con.WM_MOUSEMOVE, win32con.MK_LBUTTON, lparam_intermediate)
-                time.sleep(step_delay)  # 단계별 딜레이
-
-            # 드래그 끝: 마우스 왼쪽 버튼 떼기
-            win32gui.PostMessage(hwnd, win32con.WM_LBUTTONUP, None, lparam_end)
-            self.logger.debug(f"드래그 종료 좌표: {end_pos}")
+            # 누름 → 이동 → 뗌 을 디스패처 스레드에서 실행 (탐지 루프는 기다리지 않음)
+            # 이동 단계 수는 거리와 목표 메시지 전송률로 결정 (DragPlanner)
+            plan = get_dispatcher().drag(hwnd, start_pos, end_pos, duration=duration)
+            self.logger.debug(f"드래그 예약: {start_pos} → {end_pos}")
+            return plan
 
         except Exception as e:
             self.logger.debug(f"드래그 이벤트 처리 중 오류 발생: {e}")
@@ -187,10 +157,7 @@ class FindImage:
             hwnd (int): 대상 창의 핸들.
             x, y (int): 클릭할 창 내부 좌표.
         """
-        lparam = win32api.MAKELONG(x, y)
-        win32api.PostMessage(hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, lparam)
-
-        win32api.PostMessage(hwnd, win32con.WM_LBUTTONUP, 0, lparam)
+        return get_dispatcher().click(hwnd, x, y, hold=0.0)
 
 
 """
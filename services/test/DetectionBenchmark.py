@@ -0,0 +1,437 @@
+"""
+탐지기 벤치마크 - 라벨이 붙은 프레임 모음에서 탐지기별 속도 / 지연 / 메모리 / precision / recall 을 측정한다.
+
+라벨 파일 (코퍼스 폴더의 labels.json): { "0": [[x, y], ...], "002.png": [[x, y]] } (프레임 번호 또는 파일 이름 -> 정답 좌표)
+
+실행 예:
+    python -m services.test.DetectionBenchmark C:\\Dev\\Test\\rec_001 --template C:\\Dev\\Test\\target.png ^
+        --scales 0.8,1.0,1.2 --threshold 0.5 --output bench.json --baseline bench_prev.json
+"""
+import argparse
+import contextlib
+import glob
+import importlib.machinery
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import types
+
+import cv2
+import numpy as np
+
+from services.FrameRecorder import FrameRecording
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+DEFAULT_SCALES = [0.5, 0.7, 1.0, 1.3, 1.5, 1.7, 2.0]  # DiabloManagerApp.print_window_info 와 동일
+
+# 구 탐지 스크립트가 모듈 최상위에서 import 하지만 탐지 경로에서는 쓰지 않는 Windows 전용 모듈
+WINDOWS_ONLY_MODULES = ("win32api", "win32con", "win32gui", "win32ui", "win32process", "pyautogui", "keyboard")
+
+
+class UnsupportedDetector(Exception):
+    """현재 환경(OpenCV 빌드 등)에서 실행할 수 없는 탐지기"""
+
+
+class Corpus:
+    """벤치마크용 프레임 + 정답 좌표 묶음"""
+
+    def __init__(self, path):
+        self.path = path
+        self.names = []
+        self._recording = None
+        self._paths = None
+
+        if os.path.exists(os.path.join(path, "session.json")):
+            self._recording = FrameRecording(path)
+            self.names = [str(i) for i in range(len(self._recording))]
+        else:
+            self._paths = sorted(
+                p for p in glob.glob(os.path.join(path, "*")) if p.lower().endswith((".png", ".jpg", ".bmp"))
+            )
+            self.names = [os.path.basename(p) for p in self._paths]
+
+        labels = {}
+        label_path = os.path.join(path, "labels.json")
+        if os.path.exists(label_path):
+            with open(label_path, encoding="utf-8") as f:
+                labels = json.load(f)
+        self.labels = []
+        for index, name in enumerate(self.names):
+            points = labels.get(name, labels.get(str(index)))
+            self.labels.append(None if points is None else [tuple(p) for p in points])
+
+    def __len__(self):
+        return len(self.names)
+
+    def frame(self, index):
+        """BGRA 또는 BGR 프레임 (캡처와 같은 형식)"""
+        if self._recording is not None:
+            return self._recording[index]
+        return cv2.imread(self._paths[index], cv2.IMREAD_COLOR)
+
+
+class _WindowsOnlyModule(types.ModuleType):
+    """설치되지 않은 Windows 전용 모듈 자리. 속성은 호출하면 RuntimeError 를 내는 함수로 돌려준다."""
+
+    def __getattr__(self, attribute):
+        def unavailable(*args, **kwargs):
+            raise RuntimeError(f"{self.__name__}.{attribute} 은 Windows 에서만 사용할 수 있습니다.")
+
+        return unavailable
+
+
+@contextlib.contextmanager
+def _windows_only_stubs():
+    """설치되지 않은 WINDOWS_ONLY_MODULES 를 읽는 동안만 빈 모듈로 채운다 (Linux 에서 구 스크립트 측정용)."""
+    installed = []
+    for name in WINDOWS_ONLY_MODULES:
+        if name not in sys.modules and importlib.util.find_spec(name) is None:
+            sys.modules[name] = _WindowsOnlyModule(name)
+            installed.append(name)
+    try:
+        yield
+    finally:
+        for name in installed:
+            sys.modules.pop(name, None)
+
+
+def _load_source_module(name, path):
+    """
+    확장자가 없거나 이름에 '.' 이 있는 스크립트 파일을 모듈로 읽는다.
+    Windows 전용 모듈이 없는 환경에서는 빈 모듈로 대신한다 (탐지 경로에서 쓰지 않는 import).
+    """
+    loader = importlib.machinery.SourceFileLoader(name, path)
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    with _windows_only_stubs():
+        loader.exec_module(module)
+    return module
+
+
+def _to_bgr(frame):
+    return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR) if frame.shape[2] == 4 else frame
+
+
+def _to_gray(frame):
+    return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+
+
+def build_icon_detector(template_path, scales, threshold):
+    """현재 IconDetector (전처리 파이프라인 + _detect_green_crosses)"""
+    from services.ImageSearch import IconDetector
+
+    detector = IconDetector()
+    templates = detector.template_registry.get(template_path, scales)
+    if templates is None:
+        raise FileNotFoundError(template_path)
+
+    def detect(frame):
+        gray_frame = detector.preprocessor.process(frame)
+        return detector._detect_green_crosses(gray_frame, templates, threshold)
+
+    return detect
+
+
+def build_legacy_find_image(template_path, scales, threshold):
+    """구 클래스 FindImage.detect_icons (services/old/ImageSearch_v0.1.py)"""
+    module = _load_source_module("legacy_image_search", os.path.join(ROOT, "services", "old", "ImageSearch_v0.1.py"))
+    finder = module.FindImage()
+    template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+    if template is None:
+        raise FileNotFoundError(template_path)
+    templates = finder.resize_template(template, scales)
+
+    def detect(frame):
+        return finder.detect_icons(_to_gray(frame), templates, threshold)
+
+    return detect
+
+
+def build_icon_detector_test(template_path, scales, threshold):
+    """services/test/IconDetectorTest.detect_green_crosses (화면 출력 없는 find_green_crosses)"""
+    module = _load_source_module("icon_detector_test", os.path.join(ROOT, "services", "test", "IconDetectorTest.py"))
+    template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+    if template is None:
+        raise FileNotFoundError(template_path)
+
+    def detect(frame):
+        boxes = module.find_green_crosses(_to_bgr(frame), template, threshold, scales)
+        return [(x + w // 2, y + h // 2) for x, y, w, h in boxes]
+
+    return detect
+
+
+def build_sift(template_path, scales, threshold):
+    """TargetSearchService.match_icon_in_window 의 SIFT 경로 (match_icon_in_image). 스케일/임계값 미사용."""
+    module = _load_source_module("target_search_service", os.path.join(ROOT, "services", "TargetSearchService.py"))
+
+    def detect(frame):
+        found = module.match_icon_in_image(np.ascontiguousarray(_to_bgr(frame)), template_path)
+        return [] if found is None else [found[0]]
+
+    return detect
+
+
+def build_feature_matcher(detector):
+    """FeatureMatchService.FeatureMatcher (ORB / AKAZE). 스케일/임계값 미사용."""
+
+    def build(template_path, scales, threshold):
+        from services.FeatureMatchService import FeatureMatcher
+
+        try:
+            matcher = FeatureMatcher(detector)
+        except (ValueError, cv2.error) as e:
+            raise UnsupportedDetector(str(e)) from e
+
+        def detect(frame):
+            found = matcher.match(frame, template_path)
+            return [] if found is None else [found[0]]
+
+        return detect
+
+    return build
+
+
+DETECTORS = {
+    "icon_detector": build_icon_detector,
+    "legacy_find_image": build_legacy_find_image,
+    "icon_detector_test": build_icon_detector_test,
+    "sift": build_sift,
+    "feature_orb": build_feature_matcher("orb"),
+    "feature_akaze": build_feature_matcher("akaze"),
+}
+
+
+def match_points(predicted, expected, radius):
+    """
+    예측 좌표를 정답 좌표에 거리순으로 1:1 매칭합니다.
+    같은 정답에 중복으로 찍힌 예측은 오탐(FP)으로 센다.
+    Returns:
+        tuple: (TP, FP, FN)
+    """
+    if not predicted:
+        return 0, 0, len(expected)
+    if not expected:
+        return 0, len(predicted), 0
+
+    pred = np.asarray(predicted, dtype=np.float32).reshape(-1, 2)
+    gold = np.asarray(expected, dtype=np.float32).reshape(-1, 2)
+    distances = np.linalg.norm(pred[:, None, :] - gold[None, :, :], axis=2)
+
+    pairs = np.argwhere(distances <= radius)
+    order = np.argsort(distances[pairs[:, 0], pairs[:, 1]], kind="stable")
+    used_pred, used_gold = set(), set()
+    for p, g in pairs[order]:
+        if p in used_pred or g in used_gold:
+            continue
+        used_pred.add(p)
+        used_gold.add(g)
+
+    true_positive = len(used_gold)
+    return true_positive, len(predicted) - true_positive, len(expected) - true_positive
+
+
+def run_case(detect, corpus, radius, warmup=2, measure_memory=True):
+    """탐지기 하나 x 설정 하나를 코퍼스 전체에 대해 실행합니다."""
+    for index in range(min(warmup, len(corpus))):
+        detect(corpus.frame(index))
+
+    latencies = []
+    true_positive = false_positive = false_negative = 0
+    labelled = 0
+    total_started = time.perf_counter()
+    for index in range(len(corpus)):
+        frame = corpus.frame(index)
+        started = time.perf_counter()
+        predicted = detect(frame)
+        latencies.append(time.perf_counter() - started)
+
+        expected = corpus.labels[index]
+        if expected is not None:
+            labelled += 1
+            tp, fp, fn = match_points(predicted, expected, radius)
+            true_positive += tp
+            false_positive += fp
+            false_negative += fn
+    total_elapsed = time.perf_counter() - total_started
+
+    peak_memory = None
+    if measure_memory and len(corpus):
+        # 시간 측정과 분리: tracemalloc 은 할당마다 비용이 있으므로 별도 패스에서 측정
+        tracemalloc.start()
+        for index in range(min(len(corpus), 10)):
+            detect(corpus.frame(index))
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies_ms = np.asarray(latencies) * 1000
+    detect_time = float(np.sum(latencies)) if latencies else 0.0
+    return {
+        "frames": len(corpus),
+        "labelled_frames": labelled,
+        "fps": len(corpus) / detect_time if detect_time > 0 else None,
+        "wall_fps": len(corpus) / total_elapsed if total_elapsed > 0 else None,
+        "latency_ms": {
+            "mean": float(np.mean(latencies_ms)) if len(latencies_ms) else None,
+            "p50": float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+            "p99": float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else None,
+            "max": float(np.max(latencies_ms)) if len(latencies_ms) else None,
+        },
+        "peak_memory_bytes": peak_memory,
+        "true_positive": true_positive,
+        "false_positive": false_positive,
+        "false_negative": false_negative,
+        "precision": true_positive / (true_positive + false_positive) if true_positive + false_positive else None,
+        "recall": true_positive / (true_positive + false_negative) if true_positive + false_negative else None,
+    }
+
+
+def _environment():
+    revision = None
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        pass
+    return {
+        "timestamp": time.time(),
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmark(corpus_path, template_path, detectors, scale_sets, thresholds, radius=8, measure_memory=True):
+    """
+    Returns:
+        dict: 기계 판독용 결과 {"environment": ..., "results": [...]}
+    """
+    corpus = Corpus(corpus_path)
+    results = []
+    for name in detectors:
+        for scales in scale_sets:
+            for threshold in thresholds:
+                case = {"detector": name, "scales": list(scales), "threshold": threshold}
+                results.append(case)
+                # 만들 수 없는 탐지기만 skipped. 실행 중 오류는 error 로 남겨 compare() 에서 회귀로 잡는다
+                try:
+                    detect = DETECTORS[name](template_path, scales, threshold)
+                except UnsupportedDetector as e:
+                    case["skipped"] = f"unsupported by this cv2 build: {e}"
+                    continue
+                except Exception as e:
+                    case["skipped"] = f"could not create detector: {type(e).__name__}: {e}"
+                    continue
+                try:
+                    case.update(run_case(detect, corpus, radius, measure_memory=measure_memory))
+                except Exception as e:
+                    case["error"] = f"{type(e).__name__}: {e}"
+    return {
+        "environment": _environment(),
+        "corpus": {"path": os.path.abspath(corpus_path), "frames": len(corpus)},
+        "template": os.path.abspath(template_path),
+        "match_radius": radius,
+        "results": results,
+    }
+
+
+def _case_key(case):
+    return case["detector"], tuple(case["scales"]), case["threshold"]
+
+
+def compare(current, baseline, tolerance=0.1):
+    """
+    이전 결과와 비교해 fps / precision / recall 이 tolerance 이상 나빠진 항목을 반환합니다.
+    이전에 실행된 항목이 이번에 실행 중 오류(error)로 끝났으면 metric "error" 회귀로 반환합니다.
+    """
+    previous = {_case_key(case): case for case in baseline.get("results", [])}
+    regressions = []
+    for case in current["results"]:
+        before = previous.get(_case_key(case))
+        if before is None or "skipped" in before or "error" in before:
+            continue
+        if "error" in case:
+            regressions.append({"case": list(map(str, _case_key(case))), "metric": "error", "before": None,
+                                "after": case["error"]})
+            continue
+        if "skipped" in case:
+            continue
+        for metric in ("fps", "precision", "recall"):
+            old, new = before.get(metric), case.get(metric)
+            if old and new is not None and new < old * (1 - tolerance):
+                regressions.append({"case": list(map(str, _case_key(case))), "metric": metric, "before": old, "after": new})
+    return regressions
+
+
+def _format_table(report):
+    lines = [f"{'detector':<20} {'scales':<28} {'thr':>5} {'fps':>8} {'p50ms':>8} {'p99ms':>8} {'peakMB':>7} {'prec':>6} {'recall':>6}"]
+    for case in report["results"]:
+        scales = ",".join(str(s) for s in case["scales"])
+        if "skipped" in case:
+            lines.append(f"{case['detector']:<20} {scales:<28} {case['threshold']:>5} skipped ({case['skipped']})")
+            continue
+        if "error" in case:
+            lines.append(f"{case['detector']:<20} {scales:<28} {case['threshold']:>5} error ({case['error']})")
+            continue
+
+        def fmt(value, pattern="{:.2f}"):
+            return "-" if value is None else pattern.format(value)
+
+        peak = case["peak_memory_bytes"]
+        lines.append(
+            f"{case['detector']:<20} {scales:<28} {case['threshold']:>5} {fmt(case['fps'], '{:.1f}'):>8} "
+            f"{fmt(case['latency_ms']['p50']):>8} {fmt(case['latency_ms']['p99']):>8} "
+            f"{fmt(None if peak is None else peak / 1e6, '{:.1f}'):>7} {fmt(case['precision']):>6} {fmt(case['recall']):>6}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="녹색 십자 탐지기 벤치마크")
+    parser.add_argument("corpus", help="녹화 세션 폴더 또는 이미지 폴더 (labels.json 포함)")
+    parser.add_argument("--template", required=True, help="십자 템플릿 이미지 경로")
+    parser.add_argument("--detector", action="append", choices=sorted(DETECTORS), help="측정할 탐지기 (기본: 전체)")
+    parser.add_argument("--scales", action="append", help="쉼표로 구분한 스케일 세트 (여러 번 지정 가능)")
+    parser.add_argument("--threshold", action="append", type=float, help="탐지 임계값 (여러 번 지정 가능)")
+    parser.add_argument("--radius", type=float, default=8, help="정답으로 인정할 거리 (px)")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정 생략")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="회귀로 판단할 하락 비율")
+    args = parser.parse_args(argv)
+
+    scale_sets = [[float(s) for s in value.split(",")] for value in args.scales] if args.scales else [DEFAULT_SCALES]
+    thresholds = args.threshold or [0.6]
+    detectors = args.detector or list(DETECTORS)
+
+    report = run_benchmark(
+        args.corpus, args.template, detectors, scale_sets, thresholds, args.radius, not args.no_memory
+    )
+    print(_format_table(report))
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+        for regression in report["regressions"]:
+            print(f"[회귀] {regression}")
+        exit_code = 1 if report["regressions"] else 0
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
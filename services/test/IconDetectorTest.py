@@ -53,28 +53,17 @@ def detect_green_crosses_template_matching(image_path, template_path, threshold=
 
     return detected_positions
 
-def detect_green_crosses(image_path, template_path, threshold=0.7, scales=[0.6, 0.8, 1.0, 1.2]):
+def find_green_crosses(image, template, threshold=0.7, scales=[0.6, 0.8, 1.0, 1.2]):
     """
-    템플릿 매칭을 이용하여 녹색 십자가(+) 탐지 (다중 크기 지원)
+    템플릿 매칭을 이용하여 녹색 십자가(+) 탐지 (화면 출력 없음, 벤치마크용)
     Args:
-        image_path (str): 입력 이미지 경로
-        template_path (str): 십자 모양 템플릿 이미지 경로
+        image (numpy.ndarray): 입력 이미지 (BGR)
+        template (numpy.ndarray): 십자 모양 템플릿 이미지 (Grayscale)
         threshold (float): 매칭 민감도 (0.7~0.9 추천)
         scales (list): 템플릿 크기 조정 비율 리스트 (여러 크기 대응)
     Returns:
-        list: 탐지된 녹색 십자의 중심 좌표 리스트 [(x1, y1), (x2, y2), ...]
+        list: 탐지된 녹색 십자의 [(x, y, w, h), ...] 좌상단 좌표와 템플릿 크기 리스트
     """
-    # **[1] 이미지 로드**
-    image = cv2.imread(image_path)
-    if image is None:
-        print("이미지를 로드할 수 없습니다.")
-        return []
-
-    template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
-    if template is None:
-        print("템플릿 이미지를 로드할 수 없습니다.")
-        return []
-
     # **[2] 이미지 전처리 (HSV 변환 & 녹색 필터링)**
     hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
     lower_green = np.array([35, 60, 40])  # 기존보다 더 넓은 범위 적용
@@ -84,7 +73,7 @@ def detect_green_crosses(image_path, template_path, threshold=0.7, scales=[0.6,
     green_only = cv2.bitwise_and(image, image, mask=green_mask)
     gray = cv2.cvtColor(green_only, cv2.COLOR_BGR2GRAY)
 
-    detected_positions = []
+    detected_boxes = []
     
     # **[3] 템플릿 크기 변형하여 여러 크기 대응**
     for scale in scales:
@@ -94,12 +83,40 @@ def detect_green_crosses(image_path, template_path, threshold=0.7, scales=[0.6,
 
         h, w = resized_template.shape
         for pt in zip(*locations[::-1]):  # 템플릿과 일치하는 위치 찾기
-            center_x = pt[0] + w // 2
-            center_y = pt[1] + h // 2
-            detected_positions.append((center_x, center_y))
+            detected_boxes.append((pt[0], pt[1], w, h))
+
+    return detected_boxes
+
+def detect_green_crosses(image_path, template_path, threshold=0.7, scales=[0.6, 0.8, 1.0, 1.2]):
+    """
+    템플릿 매칭을 이용하여 녹색 십자가(+) 탐지 (다중 크기 지원)
+    Args:
+        image_path (str): 입력 이미지 경로
+        template_path (str): 십자 모양 템플릿 이미지 경로
+        threshold (float): 매칭 민감도 (0.7~0.9 추천)
+        scales (list): 템플릿 크기 조정 비율 리스트 (여러 크기 대응)
+    Returns:
+        list: 탐지된 녹색 십자의 중심 좌표 리스트 [(x1, y1), (x2, y2), ...]
+    """
+    # **[1] 이미지 로드**
+    image = cv2.imread(image_path)
+    if image is None:
+        print("이미지를 로드할 수 없습니다.")
+        return []
 
-            # **탐지된 위치 표시**
-            cv2.rectangle(image, pt, (pt[0] + w, pt[1] + h), (0, 0, 255), 2)
+    template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+    if template is None:
+        print("템플릿 이미지를 로드할 수 없습니다.")
+        return []
+
+    detected_positions = []
+    for x, y, w, h in find_green_crosses(image, template, threshold, scales):
+        center_x = x + w // 2
+        center_y = y + h // 2
+        detected_positions.append((center_x, center_y))
+
+        # **탐지된 위치 표시**
+        cv2.rectangle(image, (x, y), (x + w, y + h), (0, 0, 255), 2)
 
     # **[4] 결과 출력**
     cv2.imshow("Green Crosses Detected", image)